@@ -4,9 +4,10 @@ Balance and history management API endpoints
 from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, contains_eager
 
 from database import get_db, Wallet, BalanceHistory, Token, WalletToken
 from app.core.dependencies import logger
@@ -23,7 +24,8 @@ async def get_balance_history(
     db: AsyncSession = Depends(get_db)
 ):
     """Get balance history for a wallet with enhanced data"""
-    return await balance_service.get_wallet_balance_history(db, wallet_id, hours, days)
+    # Returned as a response so orjson serializes the datetimes directly, skipping jsonable_encoder
+    return ORJSONResponse(await balance_service.get_wallet_balance_history(db, wallet_id, hours, days))
 
 @router.get("/wallets/history/all")
 async def get_all_wallets_history(
@@ -32,7 +34,7 @@ async def get_all_wallets_history(
     db: AsyncSession = Depends(get_db)
 ):
     """Get balance history for all wallets"""
-    return await balance_service.get_all_wallets_history(db, days, hours)
+    return ORJSONResponse(await balance_service.get_all_wallets_history(db, days, hours))
 
 @router.get("/wallets/{wallet_id}/balance-history")
 async def get_wallet_balance_history(
@@ -42,18 +44,11 @@ async def get_wallet_balance_history(
 ):
     """Get balance change history for a wallet"""
     
-    # Verify wallet exists
-    wallet_result = await db.execute(
-        select(Wallet).where(Wallet.id == wallet_id)
-    )
-    wallet = wallet_result.scalar_one_or_none()
-    if not wallet:
-        raise HTTPException(status_code=404, detail="Wallet not found")
-    
-    # Get balance history
+    # Get balance history with tokens joined into the same SELECT
     result = await db.execute(
         select(BalanceHistory)
-        .join(Token)
+        .join(BalanceHistory.token)
+        .options(contains_eager(BalanceHistory.token), raiseload("*"))
         .where(BalanceHistory.wallet_id == wallet_id)
         .order_by(desc(BalanceHistory.timestamp))
         .limit(limit)
@@ -61,28 +56,31 @@ async def get_wallet_balance_history(
     
     history_records = result.scalars().all()
     
-    # Get token info for each record
-    history_list = []
-    for record in history_records:
-        token_result = await db.execute(
-            select(Token).where(Token.id == record.token_id)
+    # Only verify the wallet exists when there is no history to prove it
+    if not history_records:
+        wallet_result = await db.execute(
+            select(Wallet.id).where(Wallet.id == wallet_id)
         )
-        token = token_result.scalar_one_or_none()
-        
-        if token:
-            history_list.append({
-                "id": record.id,
-                "token_symbol": token.symbol,
-                "token_name": token.name,
-                "balance_before": record.balance_before,
-                "balance_after": record.balance_after,
-                "change_amount": record.change_amount,
-                "change_percentage": record.change_percentage,
-                "change_type": record.change_type,
-                "timestamp": record.timestamp,
-                "transaction_hash": record.transaction_hash
-            })
-    return {
+        if wallet_result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Wallet not found")
+    
+    history_list = [
+        {
+            "id": record.id,
+            "token_symbol": record.token.symbol,
+            "token_name": record.token.name,
+            "balance_before": record.balance_before,
+            "balance_after": record.balance_after,
+            "change_amount": record.change_amount,
+            "change_percentage": record.change_percentage,
+            "change_type": record.change_type,
+            "timestamp": record.timestamp,
+            "transaction_hash": record.transaction_hash
+        }
+        for record in history_records
+        if record.token
+    ]
+    return ORJSONResponse({
         "wallet_id": wallet_id,
         "history": history_list
-    }
+    })
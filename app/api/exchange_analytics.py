@@ -3,56 +3,53 @@ Exchange Analytics API
 Provides endpoints for analyzing exchange data including volume, prices, symbols, and withdrawal fees
 """
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+from cachetools import TTLCache
 import asyncio
+import csv
+import io
 import logging
-from app.services.binance_service import BinanceService
-from app.services.okx_service import OKXService
-from app.services.cointr_service import CoinTRService
-from app.services.whitebit_service import WhiteBitService
+import re
+import numpy as np
+from app.services.binance_service import binance_service
+from app.services.okx_service import okx_service
+from app.services.cointr_service import cointr_service
+from app.services.whitebit_service import whitebit_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Initialize services
-binance_service = BinanceService()
-okx_service = OKXService()
-cointr_service = CoinTRService()
-whitebit_service = WhiteBitService()
-
-# Global cache for crypto rates
-crypto_rates_cache = {
-    "usdt_try": {"rate": None, "timestamp": None},
-    "btc_usdt": {"rate": None, "timestamp": None},
-    "eth_usdt": {"rate": None, "timestamp": None},
-    "ttl": 300  # 5 minutes
-}
+# Global cache for crypto rates (5 minute TTL, expiry checked lazily on lookup)
+crypto_rates_cache = TTLCache(maxsize=16, ttl=300)
+
+# Rates returned when Binance can't be reached
+CRYPTO_FALLBACK_RATES = {"BTC": 95000.0, "ETH": 3500.0}
+
+# Seconds to wait for a rate before falling back, so a stalled exchange can't block /volume
+RATE_FETCH_TIMEOUT = 5.0
 
 async def get_usdt_try_rate():
     """
     Get USDT/TRY rate from Binance with caching
     """
-    global crypto_rates_cache
-    
-    now = datetime.now()
-    cache = crypto_rates_cache["usdt_try"]
-    
-    # Check cache
-    if (cache["rate"] is not None and 
-        cache["timestamp"] is not None and
-        (now - cache["timestamp"]).seconds < crypto_rates_cache["ttl"]):
-        return cache["rate"]
+    try:
+        return crypto_rates_cache["usdt_try"]
+    except KeyError:
+        pass
     
     # Fetch new rate
     try:
-        ticker = await EXCHANGE_SERVICES["binance"].get_24h_ticker("USDTTRY")
+        ticker = await asyncio.wait_for(
+            EXCHANGE_SERVICES["binance"].get_24h_ticker("USDTTRY"), timeout=RATE_FETCH_TIMEOUT
+        )
         rate = float(ticker.get('lastPrice', 41.7))
-        cache["rate"] = rate
-        cache["timestamp"] = now
+        crypto_rates_cache["usdt_try"] = rate
         return rate
-    except:
+    except Exception as e:
+        logger.warning(f"USDT/TRY rate fetch failed, using fallback: {e!r}")
         return 41.7  # Fallback rate
 
 async def get_crypto_usdt_rate(crypto: str):
@@ -65,75 +62,139 @@ async def get_crypto_usdt_rate(crypto: str):
     Returns:
         Rate in USDT
     """
-    global crypto_rates_cache
-    
-    now = datetime.now()
-    cache_key = f"{crypto.lower()}_usdt"
-    cache = crypto_rates_cache.get(cache_key)
-    
-    if not cache:
+    crypto = crypto.upper()
+    if crypto not in CRYPTO_FALLBACK_RATES:
         return 0.0
     
-    # Check cache
-    if (cache["rate"] is not None and 
-        cache["timestamp"] is not None and
-        (now - cache["timestamp"]).seconds < crypto_rates_cache["ttl"]):
-        return cache["rate"]
+    cache_key = f"{crypto.lower()}_usdt"
+    try:
+        return crypto_rates_cache[cache_key]
+    except KeyError:
+        pass
     
     # Fetch new rate
     try:
         symbol = f"{crypto}USDT"
-        ticker = await EXCHANGE_SERVICES["binance"].get_24h_ticker(symbol)
+        ticker = await asyncio.wait_for(
+            EXCHANGE_SERVICES["binance"].get_24h_ticker(symbol), timeout=RATE_FETCH_TIMEOUT
+        )
         rate = float(ticker.get('lastPrice', 0))
-        cache["rate"] = rate
-        cache["timestamp"] = now
+        crypto_rates_cache[cache_key] = rate
         return rate
-    except:
-        # Fallback rates
-        fallback_rates = {"BTC": 95000.0, "ETH": 3500.0}
-        return fallback_rates.get(crypto.upper(), 0.0)
+    except Exception as e:
+        logger.warning(f"{crypto}/USDT rate fetch failed, using fallback: {e!r}")
+        return CRYPTO_FALLBACK_RATES[crypto]
+
+# Quote assets we can convert to USDT, in suffix-matching priority for compact symbols
+QUOTE_ASSETS = ("USDT", "TRY", "BTC", "ETH")
+
+# Quote asset -> conversion of a quote volume to USDT using the request's rates
+USDT_VOLUME_CONVERTERS = {
+    "USDT": lambda volume, rates: volume,
+    "TRY": lambda volume, rates: volume / rates["TRY"],
+    "BTC": lambda volume, rates: volume * rates["BTC"],
+    "ETH": lambda volume, rates: volume * rates["ETH"],
+}
 
-async def calculate_usdt_volume(symbol: str, quote_volume: float, usdt_try_rate: float):
+def get_quote_asset(symbol: str) -> Optional[str]:
+    """
+    Extract the quote asset from a trading pair symbol
+    
+    Args:
+        symbol: Trading pair symbol (e.g., BTCTRY, BTC-USDT, ETH_BTC)
+    
+    Returns:
+        Quote asset if it is one we can convert, otherwise None
+    """
+    symbol_upper = symbol.upper()
+    
+    # Separated symbols (OKX BTC-USDT, WhiteBit BTC_USDT) carry the quote after the separator
+    for separator in ("-", "_"):
+        if separator in symbol_upper:
+            quote = symbol_upper.split(separator)[1]
+            return quote if quote in USDT_VOLUME_CONVERTERS else None
+    
+    for quote in QUOTE_ASSETS:
+        if symbol_upper.endswith(quote):
+            return quote
+    
+    return None
+
+def calculate_usdt_volume(symbol: str, quote_volume: float, rates: Dict[str, float]) -> float:
     """
     Calculate USDT volume based on symbol's quote asset
     
     Args:
         symbol: Trading pair symbol (e.g., BTCTRY, ETHUSDT, BTCBTC, ETHBTC)
         quote_volume: Quote currency volume
-        usdt_try_rate: Current USDT/TRY rate
+        rates: USDT rates for TRY, BTC and ETH fetched once per request
     
     Returns:
         Volume in USDT
     """
-    symbol_upper = symbol.upper()
-    
-    # If quote is already USDT, return as-is
-    if 'USDT' in symbol_upper and (symbol_upper.endswith('USDT') or '-USDT' in symbol_upper or '_USDT' in symbol_upper):
-        return quote_volume
-    
-    # If quote is TRY, convert to USDT
-    if 'TRY' in symbol_upper and (symbol_upper.endswith('TRY') or '-TRY' in symbol_upper or '_TRY' in symbol_upper):
-        return quote_volume / usdt_try_rate
+    quote = get_quote_asset(symbol)
+    converter = USDT_VOLUME_CONVERTERS.get(quote)
     
-    # If quote is BTC, convert BTC volume to USDT
-    if 'BTC' in symbol_upper and (symbol_upper.endswith('BTC') or '-BTC' in symbol_upper or '_BTC' in symbol_upper):
-        btc_rate = await get_crypto_usdt_rate('BTC')
-        if btc_rate > 0:
-            return quote_volume * btc_rate
-        logger.warning(f"Could not get BTC/USDT rate for {symbol}")
+    if converter is None:
+        logger.warning(f"Cannot calculate USDT volume for unknown quote asset: {symbol}")
         return 0.0
     
-    # If quote is ETH, convert ETH volume to USDT
-    if 'ETH' in symbol_upper and (symbol_upper.endswith('ETH') or '-ETH' in symbol_upper or '_ETH' in symbol_upper):
-        eth_rate = await get_crypto_usdt_rate('ETH')
-        if eth_rate > 0:
-            return quote_volume * eth_rate
-        logger.warning(f"Could not get ETH/USDT rate for {symbol}")
+    if quote in CRYPTO_FALLBACK_RATES and rates[quote] <= 0:
+        logger.warning(f"Could not get {quote}/USDT rate for {symbol}")
         return 0.0
     
-    # Unknown quote asset
-    logger.warning(f"Cannot calculate USDT volume for unknown quote asset: {symbol}")
-    return 0.0
+    return converter(quote_volume, rates)
+
+async def fetch_tickers(fetch_one, fetch_all, symbol_list: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch 24h tickers for the requested symbols
+    
+    Several symbols are served from one bulk request and filtered locally;
+    a single symbol keeps using the per-symbol endpoint so we don't
+    download every ticker on the exchange for one lookup. If the bulk
+    request fails, per-symbol requests run concurrently instead.
+    
+    Args:
+        fetch_one: Service coroutine returning the ticker for one symbol
+        fetch_all: Service coroutine returning all tickers keyed by symbol
+        symbol_list: Requested symbols
+    
+    Returns:
+        Dict of ticker data keyed by requested symbol
+    """
+    if len(symbol_list) > 1:
+        tickers = await fetch_all()
+        if tickers is not None:
+            return tickers
+        logger.warning("Bulk ticker fetch failed, falling back to per-symbol requests")
+    
+    semaphore = asyncio.Semaphore(EXCHANGE_FETCH_CONCURRENCY)
+    
+    async def fetch_one_bounded(symbol: str) -> Optional[Dict]:
+        async with semaphore:
+            return await fetch_one(symbol)
+    
+    results = await asyncio.gather(*map(fetch_one_bounded, symbol_list), return_exceptions=True)
+    
+    tickers = {}
+    for symbol, ticker in zip(symbol_list, results):
+        if isinstance(ticker, Exception):
+            logger.error(f"Error fetching ticker for {symbol}: {ticker}")
+        elif ticker:
+            tickers[symbol] = ticker
+    return tickers
+
+# Splits a compact symbol (BTCTRY) into base and quote for exchanges using separators
+SYMBOL_QUOTE_RE = re.compile(r'([A-Z]+)(TRY|USDT|BTC|ETH)$')
+
+# Standard interval -> OKX bar size
+OKX_INTERVAL_MAP = {"1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m", "1h": "1H", "4h": "4H", "1d": "1D"}
+
+# Rows written per chunk when streaming CSV exports
+CSV_CHUNK_ROWS = 500
+
+# Maximum number of concurrent per-symbol exchange requests per API call
+EXCHANGE_FETCH_CONCURRENCY = 16
 
 EXCHANGE_SERVICES = {
     "binance": binance_service,
@@ -142,6 +203,100 @@ EXCHANGE_SERVICES = {
     "whitebit": whitebit_service
 }
 
+# Unfiltered upstream listings (symbols, markets, coins) keyed by (kind, exchange).
+# They change rarely, so /symbols and /withdrawal-fees are served from memory.
+listings_cache = TTLCache(maxsize=16, ttl=120)
+
+# Last good listing per key, served while an expired entry refreshes in the background
+stale_listings: Dict[tuple, Any] = {}
+listing_refresh_tasks: Dict[tuple, asyncio.Task] = {}
+
+async def refresh_listing(cache_key: tuple, fetch):
+    """Fetch a listing from upstream and store it in the cache"""
+    data = await fetch()
+    if data is not None:
+        listings_cache[cache_key] = data
+        stale_listings[cache_key] = data
+    return data
+
+def finish_listing_refresh(cache_key: tuple, task: asyncio.Task):
+    """Forget a finished background refresh and log it if it failed"""
+    listing_refresh_tasks.pop(cache_key, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"❌ Background refresh of {cache_key} listing failed: {task.exception()}")
+
+async def get_cached_listing(cache_key: tuple, fetch):
+    """
+    Get an upstream listing with stale-while-revalidate caching
+    
+    Args:
+        cache_key: (kind, exchange) tuple identifying the listing
+        fetch: Service coroutine function that fetches the listing
+    
+    Returns:
+        Fresh cached listing, the stale copy while a refresh runs, or a freshly fetched listing
+    
+    Raises:
+        HTTPException: 503 when nothing is cached yet and the upstream fetch fails
+    """
+    try:
+        return listings_cache[cache_key]
+    except KeyError:
+        pass
+    
+    stale = stale_listings.get(cache_key)
+    if stale is None:
+        data = await refresh_listing(cache_key, fetch)
+        if data is None:
+            kind, exchange = cache_key
+            raise HTTPException(status_code=503, detail=f"{exchange} {kind} listing is unavailable")
+        return data
+    
+    if cache_key not in listing_refresh_tasks:
+        task = asyncio.create_task(refresh_listing(cache_key, fetch))
+        listing_refresh_tasks[cache_key] = task
+        task.add_done_callback(lambda done: finish_listing_refresh(cache_key, done))
+    
+    return stale
+
+async def get_binance_coins():
+    """Binance coin list derived from the cached symbol listing instead of a second download"""
+    symbols = await get_cached_listing(("symbols", "binance"), binance_service.get_all_symbols)
+    return await binance_service.get_all_coins_info(symbols)
+
+
+def stream_csv(rows: List[Dict[str, Any]], fieldnames: List[str], filename: str) -> StreamingResponse:
+    """
+    Stream rows as a CSV download instead of building the whole file in memory
+    
+    Args:
+        rows: Row dicts to write (keys outside fieldnames are ignored)
+        fieldnames: CSV columns
+        filename: Download filename for the Content-Disposition header
+    
+    Returns:
+        StreamingResponse yielding the CSV in chunks of CSV_CHUNK_ROWS rows
+    """
+    async def generate():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        
+        for i, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if i % CSV_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        
+        yield buffer.getvalue()
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 
 @router.get("/exchanges")
 async def get_available_exchanges():
@@ -156,6 +311,56 @@ async def get_available_exchanges():
     }
 
 
+async def get_symbols_cached(exchange: str, quote: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get trading symbols for an exchange from the cached upstream listing
+    
+    Args:
+        exchange: Exchange name (binance, okx, cointr, whitebit)
+        quote: Optional quote currency filter (e.g., USDT, BTC)
+    
+    Returns:
+        List of symbol information as provided by the exchange
+    """
+    service = EXCHANGE_SERVICES[exchange]
+    symbols = []
+    
+    # Include ALL data from the exchange; only filter on the quote suffix,
+    # built once per request rather than per symbol
+    if exchange == "binance":
+        symbols_data = await get_cached_listing(("symbols", exchange), service.get_all_symbols)
+        symbols = [
+            symbol_info for symbol_info in symbols_data
+            if not quote or symbol_info['symbol'].endswith(quote)
+        ]
+    
+    elif exchange == "okx":
+        instruments = await get_cached_listing(("symbols", exchange), service.get_all_instruments)
+        suffix = f"-{quote}" if quote else None
+        symbols = [
+            inst for inst in instruments
+            if not suffix or inst.get('instId', '').endswith(suffix)
+        ]
+    
+    elif exchange == "cointr":
+        pairs = await get_cached_listing(("symbols", exchange), service.get_trading_pairs)
+        symbols = [
+            pair for pair in pairs
+            if not quote or pair.get('counter_currency') == quote
+        ]
+    
+    elif exchange == "whitebit":
+        markets = await get_cached_listing(("symbols", exchange), service.get_markets)
+        suffix = f"_{quote}" if quote else None
+        # Add symbol to WhiteBit's info dict
+        symbols = [
+            {"symbol": symbol, **info} for symbol, info in markets.items()
+            if not suffix or symbol.endswith(suffix)
+        ]
+    
+    return symbols
+
+
 @router.get("/symbols/{exchange}")
 async def get_exchange_symbols(exchange: str, quote: Optional[str] = None):
     """
@@ -169,45 +374,7 @@ async def get_exchange_symbols(exchange: str, quote: Optional[str] = None):
         raise HTTPException(status_code=400, detail=f"Exchange {exchange} not supported")
     
     try:
-        service = EXCHANGE_SERVICES[exchange]
-        
-        if exchange == "binance":
-            symbols_data = await service.get_all_symbols()
-            symbols = []
-            for symbol_info in symbols_data:
-                if quote and not symbol_info['symbol'].endswith(quote):
-                    continue
-                # Include ALL data from Binance
-                symbols.append(symbol_info)
-        
-        elif exchange == "okx":
-            instruments = await service.get_all_instruments()
-            symbols = []
-            for inst in instruments:
-                symbol = inst.get('instId', '')
-                if quote and not symbol.endswith(f"-{quote}"):
-                    continue
-                # Include ALL data from OKX
-                symbols.append(inst)
-        
-        elif exchange == "cointr":
-            pairs = await service.get_trading_pairs()
-            symbols = []
-            for pair in pairs:
-                if quote and pair.get('counter_currency') != quote:
-                    continue
-                # Include ALL data from CoinTR
-                symbols.append(pair)
-        
-        elif exchange == "whitebit":
-            markets = await service.get_markets()
-            symbols = []
-            for symbol, info in markets.items():
-                if quote and not symbol.endswith(f"_{quote}"):
-                    continue
-                # Include ALL data from WhiteBit (add symbol to info dict)
-                full_info = {"symbol": symbol, **info}
-                symbols.append(full_info)
+        symbols = await get_symbols_cached(exchange, quote)
         
         return {
             "exchange": exchange,
@@ -215,6 +382,8 @@ async def get_exchange_symbols(exchange: str, quote: Optional[str] = None):
             "symbols": symbols
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching symbols: {str(e)}")
 
@@ -240,103 +409,108 @@ async def get_exchange_volume_analysis(
         service = EXCHANGE_SERVICES[exchange]
         symbol_list = symbols.split(',') if symbols else []
         
-        # Get USDT/TRY rate for conversion
-        usdt_try_rate = await get_usdt_try_rate()
+        # Get conversion rates once for the whole request, fetching them concurrently
+        usdt_try_rate, btc_rate, eth_rate = await asyncio.gather(
+            get_usdt_try_rate(),
+            get_crypto_usdt_rate("BTC"),
+            get_crypto_usdt_rate("ETH")
+        )
+        rates = {"TRY": usdt_try_rate, "BTC": btc_rate, "ETH": eth_rate}
         
         volume_data = []
         
         if exchange == "binance":
-            ticker_data = await service.get_24h_ticker(symbol_list[0] if symbol_list else None)
-            
-            if isinstance(ticker_data, list):
-                for ticker in ticker_data:
-                    if not symbol_list or ticker['symbol'] in symbol_list:
-                        symbol = ticker['symbol']
-                        quote_volume = float(ticker.get('quoteVolume', 0))
-                        volume_data.append({
-                            "symbol": symbol,
-                            "volume": float(ticker.get('volume', 0)),
-                            "quoteVolume": quote_volume,
-                            "usdtVolume": await calculate_usdt_volume(symbol, quote_volume, usdt_try_rate),
-                            "priceChange": float(ticker.get('priceChange', 0)),
-                            "priceChangePercent": float(ticker.get('priceChangePercent', 0)),
-                            "lastPrice": float(ticker.get('lastPrice', 0)),
-                            "trades": ticker.get('count', 0)
-                        })
+            # All requested symbols in one batch request, or every symbol when none are given
+            if symbol_list:
+                tickers = await service.get_24h_tickers(symbol_list)
+                ticker_data = list(tickers.values()) if tickers else []
             else:
-                symbol = ticker_data['symbol']
-                quote_volume = float(ticker_data.get('quoteVolume', 0))
-                volume_data.append({
-                    "symbol": symbol,
-                    "volume": float(ticker_data.get('volume', 0)),
-                    "quoteVolume": quote_volume,
-                    "usdtVolume": await calculate_usdt_volume(symbol, quote_volume, usdt_try_rate),
-                    "priceChange": float(ticker_data.get('priceChange', 0)),
-                    "priceChangePercent": float(ticker_data.get('priceChangePercent', 0)),
-                    "lastPrice": float(ticker_data.get('lastPrice', 0)),
-                    "trades": ticker_data.get('count', 0)
-                })
+                ticker_data = await service.get_24h_ticker() or []
+            
+            for ticker in ticker_data:
+                try:
+                    symbol = ticker['symbol']
+                    quote_volume = float(ticker.get('quoteVolume', 0))
+                    volume_data.append({
+                        "symbol": symbol,
+                        "volume": float(ticker.get('volume', 0)),
+                        "quoteVolume": quote_volume,
+                        "usdtVolume": calculate_usdt_volume(symbol, quote_volume, rates),
+                        "priceChange": float(ticker.get('priceChange', 0)),
+                        "priceChangePercent": float(ticker.get('priceChangePercent', 0)),
+                        "lastPrice": float(ticker.get('lastPrice', 0)),
+                        "trades": ticker.get('count', 0)
+                    })
+                except (KeyError, TypeError, ValueError) as e:
+                    # Skip a malformed ticker rather than failing the whole response
+                    logger.error(f"Binance volume error for {ticker.get('symbol')}: {e}")
         
         elif exchange == "okx":
+            tickers = await fetch_tickers(service.get_ticker, service.get_all_24hr_tickers, symbol_list)
             for symbol in symbol_list:
-                try:
-                    ticker = await service.get_ticker(symbol)
-                    if ticker:
+                ticker = tickers.get(symbol)
+                if ticker:
+                    try:
                         quote_volume = float(ticker.get('volCcy24h', 0))
                         volume_data.append({
                             "symbol": symbol,
                             "volume": float(ticker.get('vol24h', 0)),
                             "quoteVolume": quote_volume,
-                            "usdtVolume": await calculate_usdt_volume(symbol, quote_volume, usdt_try_rate),
+                            "usdtVolume": calculate_usdt_volume(symbol, quote_volume, rates),
                             "lastPrice": float(ticker.get('last', 0)),
                             "priceChange": 0,  # OKX doesn't provide direct price change
                             "priceChangePercent": 0
                         })
-                except:
-                    continue
+                    except (TypeError, ValueError) as e:
+                        # Skip a malformed ticker rather than failing the whole response
+                        logger.error(f"OKX volume error for {symbol}: {e}")
         
         elif exchange == "cointr":
+            tickers = await fetch_tickers(
+                service.get_24hr_ticker, lambda: service.get_all_24hr_tickers(symbol_list), symbol_list
+            )
             for symbol in symbol_list:
-                try:
-                    # Use get_24hr_ticker which works with CoinTR API
-                    ticker = await service.get_24hr_ticker(symbol)
-                    if ticker:
+                ticker = tickers.get(symbol)
+                if ticker:
+                    try:
                         ticker_symbol = ticker.get('symbol', symbol)
                         quote_volume = float(ticker.get('quoteVolume', 0))
                         volume_data.append({
                             "symbol": ticker_symbol,
                             "volume": float(ticker.get('volume', 0)),
                             "quoteVolume": quote_volume,
-                            "usdtVolume": await calculate_usdt_volume(ticker_symbol, quote_volume, usdt_try_rate),
+                            "usdtVolume": calculate_usdt_volume(ticker_symbol, quote_volume, rates),
                             "lastPrice": float(ticker.get('price', 0)),
                             "priceChange": float(ticker.get('change', 0)),
                             "priceChangePercent": float(ticker.get('changePercent', 0)),
                             "trades": 0
                         })
-                except Exception as e:
-                    logger.error(f"CoinTR error for {symbol}: {e}")
-                    continue
+                    except (TypeError, ValueError) as e:
+                        # Skip a malformed ticker rather than failing the whole response
+                        logger.error(f"CoinTR volume error for {symbol}: {e}")
         
         elif exchange == "whitebit":
+            # WhiteBit's ticker endpoint always returns every market, so always fetch in bulk
+            tickers = await service.get_all_24hr_tickers(symbol_list) or {}
             for symbol in symbol_list:
-                try:
-                    ticker = await service.get_24hr_ticker(symbol)
-                    if ticker:
+                ticker = tickers.get(symbol)
+                if ticker:
+                    try:
                         ticker_symbol = ticker.get('symbol', symbol)
                         quote_volume = float(ticker.get('quoteVolume', 0))
                         volume_data.append({
                             "symbol": ticker_symbol,
                             "volume": float(ticker.get('volume', 0)),
                             "quoteVolume": quote_volume,
-                            "usdtVolume": await calculate_usdt_volume(ticker_symbol, quote_volume, usdt_try_rate),
+                            "usdtVolume": calculate_usdt_volume(ticker_symbol, quote_volume, rates),
                             "lastPrice": float(ticker.get('lastPrice', 0)),
                             "priceChange": float(ticker.get('change', 0)),
                             "priceChangePercent": float(ticker.get('changePercent', 0)),
                             "trades": 0
                         })
-                except Exception as e:
-                    logger.error(f"WhiteBit error for {symbol}: {e}")
-                    continue
+                    except (TypeError, ValueError) as e:
+                        # Skip a malformed ticker rather than failing the whole response
+                        logger.error(f"WhiteBit volume error for {symbol}: {e}")
         
         # Sort by quote volume
         volume_data.sort(key=lambda x: x.get('quoteVolume', 0), reverse=True)
@@ -371,52 +545,64 @@ async def get_price_comparison(
         service = EXCHANGE_SERVICES[exchange]
         symbol_list = symbols.split(',')
         
-        price_data = []
-        
-        for symbol in symbol_list:
-            try:
-                if exchange == "binance":
-                    orderbook = await service.get_orderbook(symbol, limit=1)
-                    if orderbook and orderbook.get('asks'):
-                        ask_price = float(orderbook['asks'][0][0])
-                        ask_qty = float(orderbook['asks'][0][1])
+        if exchange == "binance":
+            # Binance returns the best ask for every requested symbol in one call
+            book_tickers = await service.get_book_tickers(symbol_list)
+            if book_tickers is not None:
+                timestamp = datetime.utcnow().isoformat()
+                price_data = []
+                for symbol in symbol_list:
+                    ticker = book_tickers.get(symbol.upper())
+                    if ticker and float(ticker['askPrice']) > 0:
                         price_data.append({
                             "symbol": symbol,
-                            "askPrice": ask_price,
-                            "askQty": ask_qty,
-                            "timestamp": datetime.utcnow().isoformat()
+                            "askPrice": float(ticker['askPrice']),
+                            "askQty": float(ticker['askQty']),
+                            "timestamp": timestamp
                         })
                 
+                return {
+                    "exchange": exchange,
+                    "count": len(price_data),
+                    "prices": price_data
+                }
+        
+        # Bound concurrency so a long symbol list doesn't trip exchange rate limits
+        semaphore = asyncio.Semaphore(EXCHANGE_FETCH_CONCURRENCY)
+        
+        async def fetch_one(symbol: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                if exchange == "binance":
+                    orderbook = await service.get_orderbook(symbol, limit=1)
+                    asks = orderbook.get('asks') if orderbook else None
                 elif exchange == "okx":
                     orderbook = await service.get_orderbook(symbol)
-                    if orderbook and orderbook.get('asks'):
-                        ask_price = float(orderbook['asks'][0][0])
-                        ask_qty = float(orderbook['asks'][0][1])
-                        price_data.append({
-                            "symbol": symbol,
-                            "askPrice": ask_price,
-                            "askQty": ask_qty,
-                            "timestamp": datetime.utcnow().isoformat()
-                        })
-                
+                    asks = orderbook.get('asks') if orderbook else None
                 elif exchange == "cointr":
                     base, quote = symbol.split('/')
                     orderbook = await service.get_order_book(base, quote)
-                    if orderbook and orderbook.get('ask'):
-                        asks = orderbook['ask']
-                        if asks:
-                            ask_price = float(asks[0][0])
-                            ask_qty = float(asks[0][1])
-                            price_data.append({
-                                "symbol": symbol,
-                                "askPrice": ask_price,
-                                "askQty": ask_qty,
-                                "timestamp": datetime.utcnow().isoformat()
-                            })
+                    asks = orderbook.get('ask') if orderbook else None
+                else:
+                    return None
+            
+            if not asks:
+                return None
             
-            except Exception as e:
-                print(f"Error fetching price for {symbol}: {e}")
-                continue
+            return {
+                "symbol": symbol,
+                "askPrice": float(asks[0][0]),
+                "askQty": float(asks[0][1]),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        
+        results = await asyncio.gather(*map(fetch_one, symbol_list), return_exceptions=True)
+        
+        price_data = []
+        for symbol, result in zip(symbol_list, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching price for {symbol}: {result}")
+            elif result is not None:
+                price_data.append(result)
         
         return {
             "exchange": exchange,
@@ -447,18 +633,20 @@ async def get_withdrawal_fees(exchange: str):
         if exchange == "binance":
             # Binance requires authentication for withdrawal fees
             # We'll return a mock structure or use public asset info
-            coins = await service.get_all_coins_info()
+            coins = await get_cached_listing(("coins", exchange), get_binance_coins)
             if coins:
-                for coin in coins:
-                    for network in coin.get('networkList', []):
-                        fees_data.append({
-                            "asset": coin.get('coin', ''),
-                            "network": network.get('network', ''),
-                            "withdrawFee": network.get('withdrawFee', '0'),
-                            "withdrawMin": network.get('withdrawMin', '0'),
-                            "withdrawMax": network.get('withdrawMax', '0'),
-                            "isDefault": network.get('isDefault', False)
-                        })
+                fees_data = [
+                    {
+                        "asset": coin.get('coin', ''),
+                        "network": network.get('network', ''),
+                        "withdrawFee": network.get('withdrawFee', '0'),
+                        "withdrawMin": network.get('withdrawMin', '0'),
+                        "withdrawMax": network.get('withdrawMax', '0'),
+                        "isDefault": network.get('isDefault', False)
+                    }
+                    for coin in coins
+                    for network in coin.get('networkList', ())
+                ]
         
         elif exchange == "okx":
             # OKX withdrawal fees require authentication
@@ -487,6 +675,8 @@ async def get_withdrawal_fees(exchange: str):
             "fees": fees_data
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching withdrawal fees: {str(e)}")
 
@@ -500,23 +690,28 @@ async def export_symbols(exchange: str, format: str = "json"):
         exchange: Exchange name
         format: Export format (json, csv)
     """
-    symbols_response = await get_exchange_symbols(exchange)
+    if exchange not in EXCHANGE_SERVICES:
+        raise HTTPException(status_code=400, detail=f"Exchange {exchange} not supported")
+    
+    try:
+        symbols = await get_symbols_cached(exchange)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching symbols: {str(e)}")
     
     if format == "csv":
-        import csv
-        import io
-        
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=['symbol', 'baseAsset', 'quoteAsset', 'status'])
-        writer.writeheader()
-        writer.writerows(symbols_response['symbols'])
-        
-        return {
-            "format": "csv",
-            "data": output.getvalue()
-        }
+        return stream_csv(
+            symbols,
+            ['symbol', 'baseAsset', 'quoteAsset', 'status'],
+            f"{exchange}_symbols.csv"
+        )
     
-    return symbols_response
+    return {
+        "exchange": exchange,
+        "count": len(symbols),
+        "symbols": symbols
+    }
 
 
 @router.post("/export/withdrawal-fees")
@@ -530,20 +725,12 @@ async def export_withdrawal_fees(exchange: str, format: str = "json"):
     """
     fees_response = await get_withdrawal_fees(exchange)
     
-    if format == "csv":
-        import csv
-        import io
-        
-        output = io.StringIO()
-        if fees_response['fees']:
-            writer = csv.DictWriter(output, fieldnames=fees_response['fees'][0].keys())
-            writer.writeheader()
-            writer.writerows(fees_response['fees'])
-            
-            return {
-                "format": "csv",
-                "data": output.getvalue()
-            }
+    if format == "csv" and fees_response['fees']:
+        return stream_csv(
+            fees_response['fees'],
+            list(fees_response['fees'][0].keys()),
+            f"{exchange}_withdrawal_fees.csv"
+        )
     
     return fees_response
 
@@ -578,16 +765,14 @@ async def get_historical_prices(
         service = EXCHANGE_SERVICES[exchange.lower()]
         
         # Format symbol for exchange
-        import re
         formatted_symbol = symbol.upper()
         if exchange.lower() == "okx":
             # OKX uses BTC-TRY format
-            formatted_symbol = re.sub(r'([A-Z]+)(TRY|USDT|BTC|ETH)$', r'\1-\2', formatted_symbol)
-            interval_map = {"1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m", "1h": "1H", "4h": "4H", "1d": "1D"}
-            interval = interval_map.get(interval, "1m")
+            formatted_symbol = SYMBOL_QUOTE_RE.sub(r'\1-\2', formatted_symbol)
+            interval = OKX_INTERVAL_MAP.get(interval, "1m")
         elif exchange.lower() == "whitebit":
             # WhiteBit uses BTC_TRY format
-            formatted_symbol = re.sub(r'([A-Z]+)(TRY|USDT|BTC|ETH)$', r'\1_\2', formatted_symbol)
+            formatted_symbol = SYMBOL_QUOTE_RE.sub(r'\1_\2', formatted_symbol)
         
         # Get klines/candles based on exchange
         if exchange.lower() == "binance":
@@ -622,39 +807,25 @@ async def get_historical_prices(
         if not data:
             raise HTTPException(status_code=404, detail="No historical data found")
         
-        # Format response
-        historical_data = []
-        for candle in data:
-            if exchange.lower() == "binance":
-                # Binance format: [openTime, open, high, low, close, volume, closeTime, quoteVolume, ...]
-                historical_data.append({
-                    "timestamp": int(candle[0]),
-                    "open": float(candle[1]),
-                    "high": float(candle[2]),
-                    "low": float(candle[3]),
-                    "close": float(candle[4]),
-                    "volume": float(candle[5])
-                })
-            elif exchange.lower() == "okx":
-                # OKX format: [timestamp, open, high, low, close, volume, volCcy, volCcyQuote, confirm]
-                historical_data.append({
-                    "timestamp": int(candle[0]),
-                    "open": float(candle[1]),
-                    "high": float(candle[2]),
-                    "low": float(candle[3]),
-                    "close": float(candle[4]),
-                    "volume": float(candle[5])
-                })
-            elif exchange.lower() in ["cointr", "whitebit"]:
-                # CoinTR and WhiteBit format (already formatted): [timestamp, open, high, low, close, volume]
-                historical_data.append({
-                    "timestamp": int(candle[0]),
-                    "open": float(candle[1]),
-                    "high": float(candle[2]),
-                    "low": float(candle[3]),
-                    "close": float(candle[4]),
-                    "volume": float(candle[5])
-                })
+        # Format response - every exchange's candles are normalized to
+        # [timestamp, open, high, low, close, volume, ...] by this point,
+        # so parse all numeric columns in one NumPy conversion
+        candles = np.asarray(data, dtype=object)[:, :6].astype(np.float64)
+        timestamps = candles[:, 0].astype(np.int64).tolist()
+        opens, highs, lows, closes, volumes = candles[:, 1:6].T.tolist()
+        
+        historical_data = [
+            {
+                "timestamp": timestamp,
+                "open": open_price,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume
+            }
+            for timestamp, open_price, high, low, close, volume
+            in zip(timestamps, opens, highs, lows, closes, volumes)
+        ]
         
         return {
             "success": True,
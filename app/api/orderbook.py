@@ -1,16 +1,126 @@
 """
 Orderbook API endpoints
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Optional
+import asyncio
+import hashlib
+import re
+from functools import lru_cache
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import ORJSONResponse, Response
+from typing import Dict, Optional, Union
+import msgpack
 from app.services.binance_service import binance_service
 from app.services.whitebit_service import whitebit_service
 from app.services.cointr_service import cointr_service
 from app.services.okx_service import okx_service
+from app.core.cache import orderbook_cache
+from app.core.exceptions import UpstreamError
 from app.core.dependencies import logger
 
 router = APIRouter(prefix="/api/orderbook", tags=["orderbook"])
 
+# Exchanges queried by the combined orderbook endpoint
+ORDERBOOK_SERVICES = {
+    "binance": binance_service,
+    "whitebit": whitebit_service,
+    "cointr": cointr_service,
+    "okx": okx_service
+}
+
+# Separator used between base and quote asset per exchange (others use no separator)
+SYMBOL_SEPARATORS = {
+    "whitebit": "_",
+    "okx": "-"
+}
+
+# Well-known pairs as (base, quote), converted once at import time
+KNOWN_SYMBOL_PAIRS = (
+    ("USDT", "TRY"), ("BTC", "TRY"), ("ETH", "TRY"), ("ADA", "TRY"), ("DOGE", "TRY"),
+    ("AVAX", "USDT"), ("SOL", "USDT"), ("BNB", "USDT")
+)
+
+SYMBOL_MAP = {
+    exchange: {f"{base}{quote}": f"{base}{separator}{quote}" for base, quote in KNOWN_SYMBOL_PAIRS}
+    for exchange, separator in SYMBOL_SEPARATORS.items()
+}
+
+# Fallback split for unknown pairs, with the minimum base length per quote asset
+SYMBOL_QUOTE_SPLIT_RE = re.compile(r"^(.+)(TRY|USDT)$")
+MIN_BASE_LENGTH = {"TRY": 3, "USDT": 2}
+
+SYMBOL_SEPARATOR_TABLE = str.maketrans("", "", "-_")
+
+# Accepted symbol query values (e.g. USDTTRY, usdt_try, USDT-TRY)
+SYMBOL_PATTERN = r"^[A-Za-z0-9_-]+$"
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Read-mostly market data tolerates a second of staleness at reverse proxies/CDNs
+EDGE_CACHE_CONTROL = "public, max-age=1, stale-while-revalidate=5"
+
+def edge_cache_headers(response: Response):
+    """Mark a successful response as briefly cacheable by shared caches"""
+    response.headers["Cache-Control"] = EDGE_CACHE_CONTROL
+
+def orderbook_etag(orderbook: Dict, symbol: str, limit: int) -> str:
+    """
+    Build an ETag for an orderbook response
+    
+    Hashes the exchange's update id or snapshot timestamp (the levels when
+    neither is available) together with the requested symbol and limit,
+    since both change the response body.
+    """
+    version = orderbook.get("lastUpdateId") or orderbook.get("timestamp")
+    if not version:
+        version = (orderbook.get("bids"), orderbook.get("asks"))
+    digest = hashlib.blake2b(repr((version, symbol, limit)).encode(), digest_size=8).hexdigest()
+    return f'"{orderbook.get("exchange")}-{digest}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+    
+    The header is a comma-separated list of entity tags or "*"; entries are
+    compared weakly, i.e. ignoring a W/ prefix, as required for If-None-Match.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+def negotiate_response(request: Request, payload: Dict, etag: Optional[str] = None) -> Union[Dict, Response]:
+    """
+    Encode payload as MessagePack when the client asks for it, JSON otherwise
+    
+    Args:
+        request: Incoming request (its Accept and If-None-Match headers are inspected)
+        payload: Response body
+        etag: Optional ETag of the payload; a matching If-None-Match yields 304
+    
+    Returns:
+        Response with msgpack body, 304 or ETag headers, or the payload for the default JSON response
+    """
+    use_msgpack = MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+    headers = None
+    
+    if etag is not None:
+        if use_msgpack:
+            # Distinct representation, distinct validator
+            etag = f'{etag[:-1]}-msgpack"'
+        headers = {"ETag": etag, "Vary": "Accept"}
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+    
+    if use_msgpack:
+        return Response(msgpack.packb(payload, use_bin_type=True), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+    if headers is not None:
+        return ORJSONResponse(payload, headers=headers)
+    return payload
+
+@lru_cache(maxsize=256)
 def convert_symbol_format(symbol: str, exchange: str) -> str:
     """
     Convert symbol format for different exchanges
@@ -22,84 +132,60 @@ def convert_symbol_format(symbol: str, exchange: str) -> str:
     Returns:
         Converted symbol format
     """
-    # Normalize symbol first (remove separators)
-    normalized = symbol.replace("-", "").replace("_", "").upper()
-    
-    if exchange.lower() == "binance":
-        # Binance: USDTTRY, BTCTRY
-        return normalized
-    elif exchange.lower() == "whitebit":
-        # WhiteBit: USDT_TRY, BTC_TRY
-        if normalized == "USDTTRY":
-            return "USDT_TRY"
-        elif normalized == "BTCTRY":
-            return "BTC_TRY"
-        elif normalized == "ETHTRY":
-            return "ETH_TRY"
-        elif normalized == "ADATRY":
-            return "ADA_TRY"
-        elif normalized == "DOGETRY":
-            return "DOGE_TRY"
-        elif normalized == "AVAXUSDT":
-            return "AVAX_USDT"
-        elif normalized == "SOLUSDT":
-            return "SOL_USDT"
-        elif normalized == "BNBUSDT":
-            return "BNB_USDT"
-        else:
-            # Fallback: try to split at common boundaries
-            if normalized.endswith("TRY"):
-                base = normalized.replace("TRY", "")
-                if len(base) >= 3:  # Valid base currency
-                    return f"{base}_TRY"
-            elif normalized.endswith("USDT"):
-                base = normalized.replace("USDT", "")
-                if len(base) >= 2:  # Valid base currency
-                    return f"{base}_USDT"
-            elif "USDT" in normalized and normalized.endswith("TRY"):
-                # Handle cases like USDTTRY -> USDT_TRY
-                return "USDT_TRY"
-            return normalized
-    elif exchange.lower() == "cointr":
-        # CoinTR: USDTTRY, BTCTRY (same as Binance)
-        return normalized
-    elif exchange.lower() == "okx":
-        # OKX: USDT-TRY, BTC-TRY
-        if normalized == "USDTTRY":
-            return "USDT-TRY"
-        elif normalized == "BTCTRY":
-            return "BTC-TRY"
-        elif normalized == "ETHTRY":
-            return "ETH-TRY"
-        elif normalized == "ADATRY":
-            return "ADA-TRY"
-        elif normalized == "DOGETRY":
-            return "DOGE-TRY"
-        elif normalized == "AVAXUSDT":
-            return "AVAX-USDT"
-        elif normalized == "SOLUSDT":
-            return "SOL-USDT"
-        elif normalized == "BNBUSDT":
-            return "BNB-USDT"
-        else:
-            # Fallback: try to split at common boundaries
-            if normalized.endswith("TRY"):
-                base = normalized.replace("TRY", "")
-                if len(base) >= 3:  # Valid base currency
-                    return f"{base}-TRY"
-            elif normalized.endswith("USDT"):
-                base = normalized.replace("USDT", "")
-                if len(base) >= 2:  # Valid base currency
-                    return f"{base}-USDT"
-            elif "USDT" in normalized and normalized.endswith("TRY"):
-                # Handle cases like USDTTRY -> USDT-TRY
-                return "USDT-TRY"
-            return normalized
-    else:
-        return normalized
+    exchange = exchange.lower()
+    separator = SYMBOL_SEPARATORS.get(exchange)
+    if separator is None:
+        # Binance, CoinTR: USDTTRY, BTCTRY
+        if symbol.isupper() and "-" not in symbol and "_" not in symbol:
+            # Already in target form (e.g. the USDTTRY default)
+            return symbol
+        return symbol.translate(SYMBOL_SEPARATOR_TABLE).upper()
+    
+    # WhiteBit: USDT_TRY, OKX: USDT-TRY
+    symbol_map = SYMBOL_MAP[exchange]
+    converted = symbol_map.get(symbol)
+    if converted is not None:
+        return converted
+    
+    # Normalize symbol (remove separators)
+    normalized = symbol.translate(SYMBOL_SEPARATOR_TABLE).upper()
+    converted = symbol_map.get(normalized)
+    if converted is not None:
+        return converted
+    
+    # Fallback: try to split at common boundaries
+    match = SYMBOL_QUOTE_SPLIT_RE.match(normalized)
+    if match:
+        base, quote = match.groups()
+        if len(base) >= MIN_BASE_LENGTH[quote]:  # Valid base currency
+            return f"{base}{separator}{quote}"
+    return normalized
+
+async def fetch_orderbook(service, converted_symbol: str, limit: int = 20) -> Optional[Dict]:
+    """
+    Fetch an orderbook, sharing the upstream call between concurrent identical requests
+    
+    Args:
+        service: Exchange service providing get_orderbook
+        converted_symbol: Symbol already in the exchange's format
+        limit: Number of levels to return
+    
+    Returns:
+        Orderbook data or None if error
+    """
+    # Keyed by the bound fetch method, so distinct (or patched) services never share entries
+    fetch = service.get_orderbook
+    return await orderbook_cache.get_or_fetch(
+        (fetch, converted_symbol, limit),
+        lambda: fetch(converted_symbol, limit)
+    )
 
 @router.get("/binance")
-async def get_binance_orderbook(symbol: str = "USDTTRY", limit: int = 20) -> Dict:
+async def get_binance_orderbook(
+    request: Request,
+    symbol: str = Query("USDTTRY", min_length=3, max_length=20, pattern=SYMBOL_PATTERN, description="Trading pair symbol"),
+    limit: int = Query(20, ge=1, le=100, description="Number of levels to return")
+) -> Dict:
     """
     Get Binance orderbook data
     
@@ -110,30 +196,27 @@ async def get_binance_orderbook(symbol: str = "USDTTRY", limit: int = 20) -> Dic
     Returns:
         Orderbook data with bids and asks
     """
-    try:
-        # Convert symbol format for Binance
-        binance_symbol = convert_symbol_format(symbol, "binance")
-        logger.info(f"🔄 Fetching Binance orderbook for {binance_symbol} (received symbol parameter: {symbol})")
-        
-        orderbook = await binance_service.get_orderbook(binance_symbol, limit)
-        
-        if orderbook is None:
-            raise HTTPException(status_code=503, detail="Failed to fetch Binance orderbook")
-        
-        return {
-            "success": True,
-            "data": orderbook,
-            "exchange": "binance",
-            "symbol": symbol,
-            "converted_symbol": binance_symbol
-        }
+    # Convert symbol format for Binance
+    binance_symbol = convert_symbol_format(symbol, "binance")
+    logger.info("🔄 Fetching Binance orderbook for %s (received symbol parameter: %s)", binance_symbol, symbol)
+    
+    orderbook = await fetch_orderbook(binance_service, binance_symbol, limit)
+    
+    if orderbook is None:
+        raise UpstreamError("binance", "orderbook", binance_symbol)
     
-    except Exception as e:
-        logger.error(f"Error fetching Binance orderbook: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return negotiate_response(request, {
+        "success": True,
+        "data": orderbook,
+        "exchange": "binance",
+        "symbol": symbol,
+        "converted_symbol": binance_symbol
+    }, etag=orderbook_etag(orderbook, symbol, limit))
 
-@router.get("/binance/price")
-async def get_binance_price(symbol: str = "USDTTRY") -> Dict:
+@router.get("/binance/price", dependencies=[Depends(edge_cache_headers)])
+async def get_binance_price(
+    symbol: str = Query("USDTTRY", min_length=3, max_length=20, pattern=SYMBOL_PATTERN, description="Trading pair symbol")
+) -> Dict:
     """
     Get current Binance price for a symbol
     
@@ -143,25 +226,22 @@ async def get_binance_price(symbol: str = "USDTTRY") -> Dict:
     Returns:
         Current price data
     """
-    try:
-        price = await binance_service.get_ticker_price(symbol)
-        
-        if price is None:
-            raise HTTPException(status_code=503, detail="Failed to fetch Binance price")
-        
-        return {
-            "success": True,
-            "symbol": symbol,
-            "price": price,
-            "exchange": "binance"
-        }
+    price = await binance_service.get_ticker_price(symbol)
     
-    except Exception as e:
-        logger.error(f"Error fetching Binance price: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if price is None:
+        raise UpstreamError("binance", "price", symbol)
+    
+    return {
+        "success": True,
+        "symbol": symbol,
+        "price": price,
+        "exchange": "binance"
+    }
 
-@router.get("/binance/ticker")
-async def get_binance_ticker(symbol: str = "USDTTRY") -> Dict:
+@router.get("/binance/ticker", dependencies=[Depends(edge_cache_headers)])
+async def get_binance_ticker(
+    symbol: str = Query("USDTTRY", min_length=3, max_length=20, pattern=SYMBOL_PATTERN, description="Trading pair symbol")
+) -> Dict:
     """
     Get 24hr ticker statistics from Binance
     
@@ -171,24 +251,22 @@ async def get_binance_ticker(symbol: str = "USDTTRY") -> Dict:
     Returns:
         24hr ticker data
     """
-    try:
-        ticker = await binance_service.get_24hr_ticker(symbol)
-        
-        if ticker is None:
-            raise HTTPException(status_code=503, detail="Failed to fetch Binance ticker")
-        
-        return {
-            "success": True,
-            "data": ticker,
-            "exchange": "binance"
-        }
+    ticker = await binance_service.get_24h_ticker(symbol)
     
-    except Exception as e:
-        logger.error(f"Error fetching Binance ticker: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if ticker is None:
+        raise UpstreamError("binance", "ticker", symbol)
+    
+    return {
+        "success": True,
+        "data": ticker,
+        "exchange": "binance"
+    }
 
 @router.get("/all")
-async def get_all_orderbooks(symbol: str = "USDTTRY") -> Dict:
+async def get_all_orderbooks(
+    request: Request,
+    symbol: str = Query("USDTTRY", min_length=3, max_length=20, pattern=SYMBOL_PATTERN, description="Trading pair symbol")
+) -> Dict:
     """
     Get orderbook data from all exchanges
     
@@ -198,31 +276,73 @@ async def get_all_orderbooks(symbol: str = "USDTTRY") -> Dict:
     Returns:
         Combined orderbook data from all exchanges
     """
-    try:
-        # Get Binance data
-        binance_data = await binance_service.get_orderbook(symbol)
-        
-        # For now, other exchanges will be mock data
-        # TODO: Implement CoinTR and WhiteBit services
-        
-        result = {
-            "success": True,
-            "symbol": symbol,
-            "exchanges": {}
+    results = await asyncio.gather(
+        *(
+            fetch_orderbook(service, convert_symbol_format(symbol, exchange))
+            for exchange, service in ORDERBOOK_SERVICES.items()
+        ),
+        return_exceptions=True
+    )
+    
+    result = {
+        "success": True,
+        "symbol": symbol,
+        "exchanges": {}
+    }
+    
+    for exchange, orderbook in zip(ORDERBOOK_SERVICES, results):
+        if isinstance(orderbook, Exception):
+            logger.error(f"❌ Error fetching {exchange} orderbook: {str(orderbook)}")
+        elif orderbook:
+            result["exchanges"][exchange] = orderbook
+    
+    return negotiate_response(request, result)
+
+@lru_cache(maxsize=1)
+def build_orderbook_config() -> Dict:
+    """
+    Build the orderbook configuration response once
+    
+    Commission and KDV rates are fixed for the lifetime of the service
+    singletons; call build_orderbook_config.cache_clear() if they change.
+    
+    Returns:
+        Configuration data
+    """
+    return {
+        "success": True,
+        "binance_commission": binance_service.commission_bps,
+        "cointr_commission": cointr_service.commission_bps,
+        "whitebit_commission": whitebit_service.commission_bps,
+        "okx_commission": okx_service.commission_bps,
+        "kdv_rate": binance_service.kdv_rate,
+        "config": {
+            "exchanges": {
+                "binance": {
+                    "commission_bps": binance_service.commission_bps,
+                    "commission_percent": binance_service.commission_bps / 100,
+                    "kdv_rate": binance_service.kdv_rate
+                },
+                "cointr": {
+                    "commission_bps": cointr_service.commission_bps,
+                    "commission_percent": cointr_service.commission_bps / 100,
+                    "kdv_rate": cointr_service.kdv_rate
+                },
+                "whitebit": {
+                    "commission_bps": whitebit_service.commission_bps,
+                    "commission_percent": whitebit_service.commission_bps / 100,
+                    "kdv_rate": whitebit_service.kdv_rate
+                },
+                "okx": {
+                    "commission_bps": okx_service.commission_bps,
+                    "commission_percent": okx_service.commission_bps / 100,
+                    "kdv_rate": okx_service.kdv_rate
+                }
+            },
+            "default_symbol": "USDTTRY",
+            "default_levels": 8
         }
-        
-        if binance_data:
-            result["exchanges"]["binance"] = binance_data
-        
-        # Add mock data for other exchanges (placeholder)
-        result["exchanges"]["cointr"] = {"status": "mock_data"}
-        result["exchanges"]["whitebit"] = {"status": "mock_data"}
-        
-        return result
-    
-    except Exception as e:
-        logger.error(f"Error fetching all orderbooks: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    }
 
 @router.get("/config")
 async def get_orderbook_config() -> Dict:
@@ -232,48 +352,14 @@ async def get_orderbook_config() -> Dict:
     Returns:
         Configuration data
     """
-    try:
-        return {
-            "success": True,
-            "binance_commission": binance_service.commission_bps,
-            "cointr_commission": cointr_service.commission_bps,
-            "whitebit_commission": whitebit_service.commission_bps,
-            "okx_commission": okx_service.commission_bps,
-            "kdv_rate": binance_service.kdv_rate,
-            "config": {
-                "exchanges": {
-                    "binance": {
-                        "commission_bps": binance_service.commission_bps,
-                        "commission_percent": binance_service.commission_bps / 100,
-                        "kdv_rate": binance_service.kdv_rate
-                    },
-                    "cointr": {
-                        "commission_bps": cointr_service.commission_bps,
-                        "commission_percent": cointr_service.commission_bps / 100,
-                        "kdv_rate": cointr_service.kdv_rate
-                    },
-                    "whitebit": {
-                        "commission_bps": whitebit_service.commission_bps,
-                        "commission_percent": whitebit_service.commission_bps / 100,
-                        "kdv_rate": whitebit_service.kdv_rate
-                    },
-                    "okx": {
-                        "commission_bps": okx_service.commission_bps,
-                        "commission_percent": okx_service.commission_bps / 100,
-                        "kdv_rate": okx_service.kdv_rate
-                    }
-                },
-                "default_symbol": "USDTTRY",
-                "default_levels": 8
-            }
-        }
-    
-    except Exception as e:
-        logger.error(f"Error getting orderbook config: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return build_orderbook_config()
 
 @router.get("/whitebit")
-async def get_whitebit_orderbook(symbol: str = "USDTTRY", limit: int = 20) -> Dict:
+async def get_whitebit_orderbook(
+    request: Request,
+    symbol: str = Query("USDTTRY", min_length=3, max_length=20, pattern=SYMBOL_PATTERN, description="Trading pair symbol"),
+    limit: int = Query(20, ge=1, le=100, description="Number of levels to return")
+) -> Dict:
     """
     Get WhiteBit orderbook data
     
@@ -284,39 +370,37 @@ async def get_whitebit_orderbook(symbol: str = "USDTTRY", limit: int = 20) -> Di
     Returns:
         Dict containing orderbook data or error
     """
-    try:
-        # Convert symbol format for WhiteBit
-        whitebit_symbol = convert_symbol_format(symbol, "whitebit")
-        logger.info(f"🔄 Fetching WhiteBit orderbook for {whitebit_symbol} (received symbol parameter: {symbol})")
-        
-        # Get orderbook from WhiteBit service
-        orderbook_data = await whitebit_service.get_orderbook(whitebit_symbol, limit)
-        
-        if orderbook_data:
-            return {
-                "success": True,
-                "data": orderbook_data,
-                "exchange": "whitebit",
-                "symbol": symbol,
-                "converted_symbol": whitebit_symbol
-            }
-        else:
-            logger.warning(f"⚠️ WhiteBit orderbook returned no data for {whitebit_symbol}")
-            return {
-                "success": False,
-                "error": "No orderbook data available",
-                "exchange": "whitebit",
-                "symbol": symbol,
-                "converted_symbol": whitebit_symbol
-            }
-    
-    except Exception as e:
-        error_msg = f"Error fetching WhiteBit orderbook: {str(e)}"
-        logger.error(f"❌ {error_msg}")
-        raise HTTPException(status_code=500, detail=error_msg)
+    # Convert symbol format for WhiteBit
+    whitebit_symbol = convert_symbol_format(symbol, "whitebit")
+    logger.info("🔄 Fetching WhiteBit orderbook for %s (received symbol parameter: %s)", whitebit_symbol, symbol)
+    
+    # Get orderbook from WhiteBit service
+    orderbook_data = await fetch_orderbook(whitebit_service, whitebit_symbol, limit)
+    
+    if orderbook_data:
+        return negotiate_response(request, {
+            "success": True,
+            "data": orderbook_data,
+            "exchange": "whitebit",
+            "symbol": symbol,
+            "converted_symbol": whitebit_symbol
+        }, etag=orderbook_etag(orderbook_data, symbol, limit))
+    else:
+        logger.warning(f"⚠️ WhiteBit orderbook returned no data for {whitebit_symbol}")
+        return negotiate_response(request, {
+            "success": False,
+            "error": "No orderbook data available",
+            "exchange": "whitebit",
+            "symbol": symbol,
+            "converted_symbol": whitebit_symbol
+        })
 
 @router.get("/cointr")
-async def get_cointr_orderbook(symbol: str = "USDTTRY", limit: int = 20) -> Dict:
+async def get_cointr_orderbook(
+    request: Request,
+    symbol: str = Query("USDTTRY", min_length=3, max_length=20, pattern=SYMBOL_PATTERN, description="Trading pair symbol"),
+    limit: int = Query(20, ge=1, le=100, description="Number of levels to return")
+) -> Dict:
     """
     Get CoinTR orderbook data
     
@@ -327,39 +411,37 @@ async def get_cointr_orderbook(symbol: str = "USDTTRY", limit: int = 20) -> Dict
     Returns:
         Dict containing orderbook data or error
     """
-    try:
-        # Convert symbol format for CoinTR
-        cointr_symbol = convert_symbol_format(symbol, "cointr")
-        logger.info(f"🔄 Fetching CoinTR orderbook for {cointr_symbol} (received symbol parameter: {symbol})")
-        
-        # Get orderbook from CoinTR service
-        orderbook_data = await cointr_service.get_orderbook(cointr_symbol, limit)
-        
-        if orderbook_data:
-            return {
-                "success": True,
-                "data": orderbook_data,
-                "exchange": "cointr",
-                "symbol": symbol,
-                "converted_symbol": cointr_symbol
-            }
-        else:
-            logger.warning(f"⚠️ CoinTR orderbook returned no data for {cointr_symbol}")
-            return {
-                "success": False,
-                "error": "No orderbook data available",
-                "exchange": "cointr",
-                "symbol": symbol,
-                "converted_symbol": cointr_symbol
-            }
-    
-    except Exception as e:
-        error_msg = f"Error fetching CoinTR orderbook: {str(e)}"
-        logger.error(f"❌ {error_msg}")
-        raise HTTPException(status_code=500, detail=error_msg)
+    # Convert symbol format for CoinTR
+    cointr_symbol = convert_symbol_format(symbol, "cointr")
+    logger.info("🔄 Fetching CoinTR orderbook for %s (received symbol parameter: %s)", cointr_symbol, symbol)
+    
+    # Get orderbook from CoinTR service
+    orderbook_data = await fetch_orderbook(cointr_service, cointr_symbol, limit)
+    
+    if orderbook_data:
+        return negotiate_response(request, {
+            "success": True,
+            "data": orderbook_data,
+            "exchange": "cointr",
+            "symbol": symbol,
+            "converted_symbol": cointr_symbol
+        }, etag=orderbook_etag(orderbook_data, symbol, limit))
+    else:
+        logger.warning(f"⚠️ CoinTR orderbook returned no data for {cointr_symbol}")
+        return negotiate_response(request, {
+            "success": False,
+            "error": "No orderbook data available",
+            "exchange": "cointr",
+            "symbol": symbol,
+            "converted_symbol": cointr_symbol
+        })
 
 @router.get("/okx")
-async def get_okx_orderbook(symbol: str = "USDTTRY", limit: int = 20) -> Dict:
+async def get_okx_orderbook(
+    request: Request,
+    symbol: str = Query("USDTTRY", min_length=3, max_length=20, pattern=SYMBOL_PATTERN, description="Trading pair symbol"),
+    limit: int = Query(20, ge=1, le=100, description="Number of levels to return")
+) -> Dict:
     """
     Get OKX orderbook data
     
@@ -370,33 +452,27 @@ async def get_okx_orderbook(symbol: str = "USDTTRY", limit: int = 20) -> Dict:
     Returns:
         Dict containing orderbook data or error
     """
-    try:
-        # Convert symbol format for OKX
-        okx_symbol = convert_symbol_format(symbol, "okx")
-        logger.info(f"🔄 Fetching OKX orderbook for {okx_symbol} (received symbol parameter: {symbol})")
-        
-        # Get orderbook from OKX service
-        orderbook_data = await okx_service.get_orderbook(okx_symbol, limit)
-        
-        if orderbook_data:
-            return {
-                "success": True,
-                "data": orderbook_data,
-                "exchange": "okx",
-                "symbol": symbol,
-                "converted_symbol": okx_symbol
-            }
-        else:
-            logger.warning(f"⚠️ OKX orderbook returned no data for {okx_symbol}")
-            return {
-                "success": False,
-                "error": "No orderbook data available",
-                "exchange": "okx",
-                "symbol": symbol,
-                "converted_symbol": okx_symbol
-            }
-    
-    except Exception as e:
-        error_msg = f"Error fetching OKX orderbook: {str(e)}"
-        logger.error(f"❌ {error_msg}")
-        raise HTTPException(status_code=500, detail=error_msg)
+    # Convert symbol format for OKX
+    okx_symbol = convert_symbol_format(symbol, "okx")
+    logger.info("🔄 Fetching OKX orderbook for %s (received symbol parameter: %s)", okx_symbol, symbol)
+    
+    # Get orderbook from OKX service
+    orderbook_data = await fetch_orderbook(okx_service, okx_symbol, limit)
+    
+    if orderbook_data:
+        return negotiate_response(request, {
+            "success": True,
+            "data": orderbook_data,
+            "exchange": "okx",
+            "symbol": symbol,
+            "converted_symbol": okx_symbol
+        }, etag=orderbook_etag(orderbook_data, symbol, limit))
+    else:
+        logger.warning(f"⚠️ OKX orderbook returned no data for {okx_symbol}")
+        return negotiate_response(request, {
+            "success": False,
+            "error": "No orderbook data available",
+            "exchange": "okx",
+            "symbol": symbol,
+            "converted_symbol": okx_symbol
+        })
@@ -1,6 +1,7 @@
 """
 Synthetics API endpoints for creating synthetic orderbooks
 """
+from functools import lru_cache
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import Dict, List, Literal
@@ -9,6 +10,43 @@ from app.core.dependencies import logger
 
 router = APIRouter(prefix="/api/synthetics", tags=["synthetics"])
 
+# Example leg chains served by /examples
+SYNTHETIC_EXAMPLES = [
+    {
+        "name": "ETH/TRY via USDT",
+        "description": "ETH to TRY through USDT (Binance + CoinTR)",
+        "legs": [
+            {"exchange": "binance", "symbol": "ETHUSDT", "side": "sell"},
+            {"exchange": "cointr", "symbol": "USDTTRY", "side": "sell"}
+        ],
+        "expected_pair": "ETHTRY"
+    },
+    {
+        "name": "BTC/TRY via USDT",
+        "description": "BTC to TRY through USDT (Binance + CoinTR)",
+        "legs": [
+            {"exchange": "binance", "symbol": "BTCUSDT", "side": "sell"},
+            {"exchange": "cointr", "symbol": "USDTTRY", "side": "sell"}
+        ],
+        "expected_pair": "BTCTRY"
+    },
+    {
+        "name": "Multi-hop arbitrage",
+        "description": "Complex 3-leg chain for arbitrage opportunities",
+        "legs": [
+            {"exchange": "binance", "symbol": "ETHUSDT", "side": "sell"},
+            {"exchange": "okx", "symbol": "USDTTRY", "side": "sell"},
+            {"exchange": "whitebit", "symbol": "TRYETH", "side": "buy"}
+        ],
+        "expected_pair": "ETHETH"
+    }
+]
+
+SYNTHETIC_EXAMPLES_RESPONSE = {
+    "success": True,
+    "examples": SYNTHETIC_EXAMPLES
+}
+
 class LegConfig(BaseModel):
     exchange: Literal["binance", "cointr", "whitebit", "okx"] = Field(..., description="Exchange name")
     symbol: str = Field(..., description="Trading pair symbol (e.g., ETHUSDT, USDTTRY)")
@@ -42,7 +80,7 @@ async def create_synthetic_orderbook(request: SyntheticOrderbookRequest) -> Dict
         logger.info(f"🔗 Creating synthetic orderbook with {len(request.legs)} legs")
         
         # Convert Pydantic models to dicts
-        legs_data = [leg.dict() for leg in request.legs]
+        legs_data = [leg.model_dump() for leg in request.legs]
         
         # Create synthetic orderbook
         result = await synthetics_service.create_synthetic_orderbook(
@@ -63,6 +101,27 @@ async def create_synthetic_orderbook(request: SyntheticOrderbookRequest) -> Dict
         logger.error(f"❌ {error_msg}")
         raise HTTPException(status_code=500, detail=error_msg)
 
+@lru_cache(maxsize=1)
+def build_synthetics_config() -> Dict:
+    """
+    Build the synthetics configuration response once
+    
+    Returns:
+        Configuration data for synthetics
+    """
+    return {
+        "success": True,
+        "supported_exchanges": list(synthetics_service.exchange_services.keys()),
+        "commission_rates": synthetics_service.commission_bps,
+        "limits": {
+            "max_legs": synthetics_service.max_legs,
+            "max_depth": synthetics_service.max_depth,
+            "min_legs": 2
+        },
+        "supported_sides": ["buy", "sell"],
+        "note": "KDV is ignored in synthetic calculations; only exchange commissions applied"
+    }
+
 @router.get("/config")
 async def get_synthetics_config() -> Dict:
     """
@@ -72,18 +131,7 @@ async def get_synthetics_config() -> Dict:
         Configuration data for synthetics
     """
     try:
-        return {
-            "success": True,
-            "supported_exchanges": list(synthetics_service.exchange_services.keys()),
-            "commission_rates": synthetics_service.commission_bps,
-            "limits": {
-                "max_legs": synthetics_service.max_legs,
-                "max_depth": synthetics_service.max_depth,
-                "min_legs": 2
-            },
-            "supported_sides": ["buy", "sell"],
-            "note": "KDV is ignored in synthetic calculations; only exchange commissions applied"
-        }
+        return build_synthetics_config()
     
     except Exception as e:
         error_msg = f"Error getting synthetics config: {str(e)}"
@@ -98,44 +146,4 @@ async def get_synthetic_examples() -> Dict:
     Returns:
         List of example configurations
     """
-    try:
-        examples = [
-            {
-                "name": "ETH/TRY via USDT",
-                "description": "ETH to TRY through USDT (Binance + CoinTR)",
-                "legs": [
-                    {"exchange": "binance", "symbol": "ETHUSDT", "side": "sell"},
-                    {"exchange": "cointr", "symbol": "USDTTRY", "side": "sell"}
-                ],
-                "expected_pair": "ETHTRY"
-            },
-            {
-                "name": "BTC/TRY via USDT",
-                "description": "BTC to TRY through USDT (Binance + CoinTR)",
-                "legs": [
-                    {"exchange": "binance", "symbol": "BTCUSDT", "side": "sell"},
-                    {"exchange": "cointr", "symbol": "USDTTRY", "side": "sell"}
-                ],
-                "expected_pair": "BTCTRY"
-            },
-            {
-                "name": "Multi-hop arbitrage",
-                "description": "Complex 3-leg chain for arbitrage opportunities",
-                "legs": [
-                    {"exchange": "binance", "symbol": "ETHUSDT", "side": "sell"},
-                    {"exchange": "okx", "symbol": "USDTTRY", "side": "sell"},
-                    {"exchange": "whitebit", "symbol": "TRYETH", "side": "buy"}
-                ],
-                "expected_pair": "ETHETH"
-            }
-        ]
-        
-        return {
-            "success": True,
-            "examples": examples
-        }
-    
-    except Exception as e:
-        error_msg = f"Error getting synthetic examples: {str(e)}"
-        logger.error(f"❌ {error_msg}")
-        raise HTTPException(status_code=500, detail=error_msg)
+    return SYNTHETIC_EXAMPLES_RESPONSE
@@ -1,60 +1,103 @@
 """
 System status and monitoring API endpoints
 """
+import asyncio
+import copy
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select, func, and_
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from fastapi import APIRouter
+from sqlalchemy import Row, select, func
 
-from database import get_db, Blockchain, Wallet, Token, BalanceHistory, WalletToken
-from app.core.config import APP_VERSION
+from database import AsyncSessionLocal, Blockchain, Wallet, Token, BalanceHistory, WalletToken
+from app.core.cache import status_cache, get_status_cache_key
+from app.core.config import (
+    APP_VERSION, WEBSOCKET_HOST, WEBSOCKET_PORT, WEBSOCKET_PROTOCOL,
+    FRONTEND_REFRESH_INTERVAL, TRANSACTION_REFRESH_INTERVAL,
+    MAX_TRANSACTIONS_DISPLAY
+)
 
 router = APIRouter(prefix="/api", tags=["system"])
 
+@lru_cache(maxsize=1)
+def build_frontend_config() -> Dict:
+    """
+    Build the frontend configuration response once
+    
+    Derived from environment settings read at startup.
+    
+    Returns:
+        Configuration data for the frontend
+    """
+    return {
+        "websocket": {
+            "host": WEBSOCKET_HOST,
+            "port": WEBSOCKET_PORT,
+            "protocol": WEBSOCKET_PROTOCOL
+        },
+        "frontend": {
+            "refresh_interval": FRONTEND_REFRESH_INTERVAL,
+            "transaction_refresh_interval": TRANSACTION_REFRESH_INTERVAL,
+            "max_transactions_display": MAX_TRANSACTIONS_DISPLAY
+        }
+    }
+
+async def read_all(statement) -> List[Row]:
+    """Run a read-only statement on its own session so independent queries can run concurrently"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(statement)
+        return result.all()
+
 @router.get("/status")
-async def get_system_status(db: AsyncSession = Depends(get_db)):
+async def get_system_status():
     """Get overall system status and statistics"""
     
-    # Get blockchain stats
-    blockchain_result = await db.execute(
-        select(Blockchain).where(Blockchain.is_active == True)
-    )
-    blockchains = blockchain_result.scalars().all()
+    # 24h window start rounded down to the minute: keeps the bound value (and the
+    # cache key) stable for a minute, so balance_changes_24h may lag by up to 60s
+    recent_bound = datetime.utcnow().replace(second=0, microsecond=0) - timedelta(hours=24)
     
-    # Get wallet counts by blockchain
-    wallet_stats = {}
-    total_wallets = 0
+    cache_key = get_status_cache_key(recent_bound)
+    cached_status = status_cache.get(cache_key)
+    if cached_status is not None:
+        return cached_status
     
-    for blockchain in blockchains:
-        wallet_count_result = await db.execute(
-            select(func.count(Wallet.id))
-            .where(
-                and_(
-                    Wallet.blockchain_id == blockchain.id,
-                    Wallet.is_active == True
-                )
+    # Independent queries, each on its own session/connection
+    blockchain_rows, wallet_count_rows, count_rows = await asyncio.gather(
+        # Blockchain stats
+        read_all(select(Blockchain).where(Blockchain.is_active == True)),
+        # Wallet counts by blockchain in a single grouped query
+        read_all(
+            select(Wallet.blockchain_id, func.count(Wallet.id))
+            .where(Wallet.is_active == True)
+            .group_by(Wallet.blockchain_id)
+        ),
+        # Token count and recent balance changes as scalar subqueries of one statement
+        read_all(
+            select(
+                select(func.count(Token.id))
+                .where(Token.is_verified == True)
+                .scalar_subquery()
+                .label("total_tokens"),
+                select(func.count(BalanceHistory.id))
+                .where(BalanceHistory.timestamp >= recent_bound)
+                .scalar_subquery()
+                .label("recent_changes")
             )
         )
-        wallet_count = wallet_count_result.scalar()
-        wallet_stats[blockchain.name] = wallet_count
-        total_wallets += wallet_count
-    
-    # Get token count
-    token_count_result = await db.execute(
-        select(func.count(Token.id)).where(Token.is_verified == True)
     )
-    total_tokens = token_count_result.scalar()
     
-    # Get recent balance changes
-    recent_changes_result = await db.execute(
-        select(func.count(BalanceHistory.id))
-        .where(BalanceHistory.timestamp >= datetime.utcnow() - timedelta(hours=24))
-    )
-    recent_changes = recent_changes_result.scalar()
+    blockchains = [row[0] for row in blockchain_rows]
+    wallet_counts = dict(wallet_count_rows)
+    total_tokens, recent_changes = count_rows[0]
     
-    return {
+    wallet_stats = {
+        blockchain.name: wallet_counts.get(blockchain.id, 0)
+        for blockchain in blockchains
+    }
+    total_wallets = sum(wallet_stats.values())
+    
+    system_status = {
         "status": "running",
         "version": APP_VERSION,
         "uptime_info": "Multi-blockchain wallet monitoring active",
@@ -77,77 +120,77 @@ async def get_system_status(db: AsyncSession = Depends(get_db)):
             "ethereum_monitor": "active"
         }
     }
+    
+    status_cache.set(cache_key, system_status)
+    return system_status
 
 @router.get("/summary")
-async def get_portfolio_summary(db: AsyncSession = Depends(get_db)):
+async def get_portfolio_summary():
     """Get portfolio summary across all wallets"""
     
-    # Get all wallets with balances
-    result = await db.execute(
-        select(Wallet)
-        .options(
-            selectinload(Wallet.blockchain_ref),
-            selectinload(Wallet.wallet_tokens).selectinload(WalletToken.token)
-        )
-        .where(Wallet.is_active == True)
+    # Positions = active wallet/token pairs holding a positive balance
+    positions = (
+        select(WalletToken.id, WalletToken.balance, Token.symbol, Blockchain.name.label("blockchain"))
+        .select_from(WalletToken)
+        .join(WalletToken.token)
+        .join(WalletToken.wallet)
+        .join(Wallet.blockchain_ref)
+        .where(Wallet.is_active == True, WalletToken.balance > 0)
+        .subquery()
     )
     
-    wallets = result.scalars().all()
+    # Aggregate in the database instead of loading every wallet and token
+    wallet_count_rows, position_count_rows, top_token_rows = await asyncio.gather(
+        read_all(
+            select(Blockchain.name, func.count(Wallet.id))
+            .select_from(Wallet)
+            .join(Wallet.blockchain_ref)
+            .where(Wallet.is_active == True)
+            .group_by(Blockchain.name)
+        ),
+        read_all(
+            select(positions.c.blockchain, func.count(positions.c.id))
+            .group_by(positions.c.blockchain)
+        ),
+        # Top 10 tokens by occurrence across wallets
+        read_all(
+            select(
+                positions.c.symbol,
+                func.sum(positions.c.balance).label("total_balance"),
+                func.count(positions.c.id).label("wallet_count"),
+                # A symbol held on several chains reports the alphabetically first one;
+                # the old Python loop reported whichever wallet it happened to load first
+                func.min(positions.c.blockchain)
+            )
+            .group_by(positions.c.symbol)
+            .order_by(func.count(positions.c.id).desc(), func.sum(positions.c.balance).desc())
+            .limit(10)
+        )
+    )
     
-    # Aggregate data
-    portfolio_summary = {
-        "total_wallets": len(wallets),
-        "blockchains": {},
-        "top_tokens": {},
-        "total_positions": 0
-    }
+    position_counts = dict(position_count_rows)
     
-    for wallet in wallets:
-        blockchain_name = wallet.blockchain_ref.name
-        
-        if blockchain_name not in portfolio_summary["blockchains"]:
-            portfolio_summary["blockchains"][blockchain_name] = {
-                "wallet_count": 0,
-                "total_tokens": 0,
+    return {
+        "total_wallets": sum(wallet_count for _, wallet_count in wallet_count_rows),
+        "blockchains": {
+            blockchain_name: {
+                "wallet_count": wallet_count,
+                "total_tokens": position_counts.get(blockchain_name, 0),
                 "top_balances": []
             }
-        
-        portfolio_summary["blockchains"][blockchain_name]["wallet_count"] += 1
-        
-        for wallet_token in wallet.wallet_tokens:
-            if wallet_token.balance > 0:
-                portfolio_summary["total_positions"] += 1
-                portfolio_summary["blockchains"][blockchain_name]["total_tokens"] += 1
-                
-                token_symbol = wallet_token.token.symbol
-                if token_symbol not in portfolio_summary["top_tokens"]:
-                    portfolio_summary["top_tokens"][token_symbol] = {
-                        "total_balance": 0,
-                        "wallet_count": 0,
-                        "blockchain": blockchain_name
-                    }
-                
-                portfolio_summary["top_tokens"][token_symbol]["total_balance"] += wallet_token.balance
-                portfolio_summary["top_tokens"][token_symbol]["wallet_count"] += 1
-    
-    # Sort top tokens by occurrence across wallets
-    top_tokens_list = sorted(
-        [
+            for blockchain_name, wallet_count in wallet_count_rows
+        },
+        "top_tokens": [
             {
                 "symbol": symbol,
-                "total_balance": data["total_balance"],
-                "wallet_count": data["wallet_count"],
-                "blockchain": data["blockchain"]
+                "total_balance": total_balance,
+                "wallet_count": wallet_count,
+                "blockchain": blockchain_name
             }
-            for symbol, data in portfolio_summary["top_tokens"].items()
+            for symbol, total_balance, wallet_count, blockchain_name in top_token_rows
         ],
-        key=lambda x: (x["wallet_count"], x["total_balance"]),
-        reverse=True
-    )[:10]  # Top 10 tokens
-    
-    portfolio_summary["top_tokens"] = top_tokens_list
-    
-    return portfolio_summary
+        "total_positions": sum(position_counts.values())
+    }
 
 @router.get("/health")
 async def health_check():
@@ -157,21 +200,5 @@ async def health_check():
 @router.get("/config")
 async def get_frontend_config():
     """Get frontend configuration"""
-    from app.core.config import (
-        WEBSOCKET_HOST, WEBSOCKET_PORT, WEBSOCKET_PROTOCOL,
-        FRONTEND_REFRESH_INTERVAL, TRANSACTION_REFRESH_INTERVAL, 
-        MAX_TRANSACTIONS_DISPLAY
-    )
-    
-    return {
-        "websocket": {
-            "host": WEBSOCKET_HOST,
-            "port": WEBSOCKET_PORT,
-            "protocol": WEBSOCKET_PROTOCOL
-        },
-        "frontend": {
-            "refresh_interval": FRONTEND_REFRESH_INTERVAL,
-            "transaction_refresh_interval": TRANSACTION_REFRESH_INTERVAL,
-            "max_transactions_display": MAX_TRANSACTIONS_DISPLAY
-        }
-    }
+    # A copy, so nothing downstream can modify the cached dict
+    return copy.deepcopy(build_frontend_config())
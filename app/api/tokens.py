@@ -9,7 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from database import get_db, Token, WalletToken
-from schemas import TokenResponse, BlockchainResponse
+from schemas import TokenResponse, BlockchainResponse, TokenVisibilityUpdate
+from app.core.cache import tokens_cache, get_tokens_cache_key
 
 router = APIRouter(prefix="/api", tags=["tokens"])
 
@@ -21,6 +22,11 @@ async def get_tokens(
 ):
     """Get available tokens, optionally filtered by blockchain"""
     
+    cache_key = get_tokens_cache_key(blockchain_id, verified_only)
+    cached_tokens = tokens_cache.get(cache_key)
+    if cached_tokens is not None:
+        return cached_tokens
+    
     query = select(Token).options(selectinload(Token.blockchain_ref))
     
     if blockchain_id:
@@ -57,8 +63,59 @@ async def get_tokens(
         )
         token_list.append(token_response)
     
+    tokens_cache.set(cache_key, [token.model_dump(mode="json") for token in token_list])
     return token_list
 
+async def set_tokens_hidden(db: AsyncSession, wallet_id: int, token_ids: List[int], is_hidden: bool) -> int:
+    """
+    Set is_hidden for several tokens of a wallet with a single UPDATE
+    
+    Args:
+        db: Database session (caller commits)
+        wallet_id: Wallet ID
+        token_ids: Token IDs to update
+        is_hidden: New visibility flag
+    
+    Returns:
+        Number of wallet_token rows updated
+    """
+    if not token_ids:
+        return 0
+    
+    result = await db.execute(
+        update(WalletToken)
+        .where(WalletToken.wallet_id == wallet_id)
+        .where(WalletToken.token_id.in_(token_ids))
+        .values(is_hidden=is_hidden)
+    )
+    return result.rowcount
+
+@router.post("/tokens/{wallet_id}/visibility")
+async def update_token_visibility(
+    wallet_id: int,
+    visibility: TokenVisibilityUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Hide and show several tokens of a wallet in one transaction"""
+    if set(visibility.hidden) & set(visibility.shown):
+        raise HTTPException(status_code=400, detail="A token cannot be both hidden and shown")
+    
+    try:
+        hidden_count = await set_tokens_hidden(db, wallet_id, visibility.hidden, True)
+        shown_count = await set_tokens_hidden(db, wallet_id, visibility.shown, False)
+        await db.commit()
+        
+        return {
+            "message": "Token visibility updated successfully",
+            "wallet_id": wallet_id,
+            "hidden_count": hidden_count,
+            "shown_count": shown_count
+        }
+        
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error updating token visibility: {str(e)}")
+
 @router.post("/tokens/{wallet_id}/{token_id}/hide")
 async def hide_token(
     wallet_id: int,
@@ -67,25 +124,16 @@ async def hide_token(
 ):
     """Hide a specific token from wallet display"""
     try:
-        # Update the wallet_token record to set is_hidden = True
-        query = (
-            update(WalletToken)
-            .where(WalletToken.wallet_id == wallet_id)
-            .where(WalletToken.token_id == token_id)
-            .values(is_hidden=True)
-        )
-        
-        result = await db.execute(query)
+        updated = await set_tokens_hidden(db, wallet_id, [token_id], True)
         await db.commit()
-        
-        if result.rowcount == 0:
-            raise HTTPException(status_code=404, detail="Wallet token not found")
-        
-        return {"message": "Token hidden successfully", "wallet_id": wallet_id, "token_id": token_id}
-        
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error hiding token: {str(e)}")
+    
+    if updated == 0:
+        raise HTTPException(status_code=404, detail="Wallet token not found")
+    
+    return {"message": "Token hidden successfully", "wallet_id": wallet_id, "token_id": token_id}
 
 @router.post("/tokens/{wallet_id}/{token_id}/show")
 async def show_token(
@@ -95,22 +143,13 @@ async def show_token(
 ):
     """Show a previously hidden token in wallet display"""
     try:
-        # Update the wallet_token record to set is_hidden = False
-        query = (
-            update(WalletToken)
-            .where(WalletToken.wallet_id == wallet_id)
-            .where(WalletToken.token_id == token_id)
-            .values(is_hidden=False)
-        )
-        
-        result = await db.execute(query)
+        updated = await set_tokens_hidden(db, wallet_id, [token_id], False)
         await db.commit()
-        
-        if result.rowcount == 0:
-            raise HTTPException(status_code=404, detail="Wallet token not found")
-        
-        return {"message": "Token shown successfully", "wallet_id": wallet_id, "token_id": token_id}
-        
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error showing token: {str(e)}")
+    
+    if updated == 0:
+        raise HTTPException(status_code=404, detail="Wallet token not found")
+    
+    return {"message": "Token shown successfully", "wallet_id": wallet_id, "token_id": token_id}
@@ -1,11 +1,11 @@
 """
 Wallet management API endpoints
 """
-from typing import List
+from typing import List, Optional
 import asyncio
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -15,7 +15,8 @@ from schemas import (
     WalletCreate, WalletResponse, WalletWithBalances, TokenBalance,
     BlockchainResponse, LegacyWalletCreate, LegacyWalletResponse
 )
-from app.core.dependencies import logger
+from app.core.cache import blockchain_cache, get_blockchain_cache_key, invalidate_history_cache
+from app.core.dependencies import logger, BLOCKCHAINS_BY_ID, BLOCKCHAINS_BY_NAME, remember_blockchain
 from app.services.wallet_service import WalletService
 from websocket_manager import manager
 
@@ -25,22 +26,36 @@ wallet_service = WalletService()
 @router.get("/blockchains", response_model=List[BlockchainResponse])
 async def get_blockchains(db: AsyncSession = Depends(get_db)):
     """Get all supported blockchains"""
+    cache_key = get_blockchain_cache_key()
+    cached_blockchains = blockchain_cache.get(cache_key)
+    if cached_blockchains is not None:
+        return cached_blockchains
+    
     result = await db.execute(select(Blockchain).where(Blockchain.is_active == True))
-    blockchains = result.scalars().all()
+    blockchains = [BlockchainResponse.model_validate(blockchain) for blockchain in result.scalars().all()]
+    
+    blockchain_cache.set(cache_key, [blockchain.model_dump(mode="json") for blockchain in blockchains])
     return blockchains
 
-@router.post("/wallets", response_model=WalletResponse)
-async def create_wallet(wallet_data: WalletCreate, db: AsyncSession = Depends(get_db)):
-    """Add a new wallet for monitoring"""
-    
-    logger.info(f"POST /api/wallets called with data: {wallet_data}")
-    
+async def add_wallet(address: str, name: Optional[str], blockchain: Blockchain, db: AsyncSession) -> Wallet:
+    """
+    Insert a wallet for an already-resolved blockchain and start monitoring it
+    
+    Args:
+        address: Wallet address
+        name: Optional display name
+        blockchain: Blockchain row the wallet belongs to
+        db: Database session
+    
+    Returns:
+        The created wallet
+    """
     # Check if wallet already exists
     existing = await db.execute(
         select(Wallet).where(
             and_(
-                Wallet.address == wallet_data.address,
-                Wallet.blockchain_id == wallet_data.blockchain_id
+                Wallet.address == address,
+                Wallet.blockchain_id == blockchain.id
             )
         )
     )
@@ -48,24 +63,18 @@ async def create_wallet(wallet_data: WalletCreate, db: AsyncSession = Depends(ge
     if existing.scalar_one_or_none():
         raise HTTPException(status_code=400, detail="Wallet already exists")
     
-    # Verify blockchain exists
-    blockchain_result = await db.execute(
-        select(Blockchain).where(Blockchain.id == wallet_data.blockchain_id)
-    )
-    blockchain = blockchain_result.scalar_one_or_none()
-    if not blockchain:
-        raise HTTPException(status_code=400, detail="Invalid blockchain ID")
-    
     # Create wallet
     wallet = Wallet(
-        address=wallet_data.address,
-        name=wallet_data.name,
-        blockchain_id=wallet_data.blockchain_id
+        address=address,
+        name=name,
+        blockchain_id=blockchain.id
     )
     
     db.add(wallet)
     await db.commit()
     await db.refresh(wallet)
+    # get_all_wallets_history lists every active wallet
+    invalidate_history_cache()
     
     # Start initial balance fetch in background
     asyncio.create_task(wallet_service.fetch_initial_balances(wallet.id, wallet.address, blockchain.name))
@@ -83,10 +92,45 @@ async def create_wallet(wallet_data: WalletCreate, db: AsyncSession = Depends(ge
     logger.info(f"New wallet added: {wallet.address} on {blockchain.name}")
     return wallet
 
+@router.post("/wallets", response_model=WalletResponse)
+async def create_wallet(wallet_data: WalletCreate, db: AsyncSession = Depends(get_db)):
+    """Add a new wallet for monitoring"""
+    
+    logger.info(f"POST /api/wallets called with data: {wallet_data}")
+    
+    # Verify blockchain exists, falling back to the database on a lookup miss
+    blockchain = BLOCKCHAINS_BY_ID.get(wallet_data.blockchain_id)
+    if blockchain is None:
+        blockchain_result = await db.execute(
+            select(Blockchain).where(Blockchain.id == wallet_data.blockchain_id)
+        )
+        blockchain = blockchain_result.scalar_one_or_none()
+        if blockchain:
+            remember_blockchain(blockchain)
+    if not blockchain:
+        raise HTTPException(status_code=400, detail="Invalid blockchain ID")
+    
+    return await add_wallet(wallet_data.address, wallet_data.name, blockchain, db)
+
 @router.get("/wallets", response_model=List[WalletWithBalances])
-async def get_wallets(db: AsyncSession = Depends(get_db)):
-    """Get all monitored wallets with their current balances"""
-    return await wallet_service.get_wallets_with_balances(db)
+async def get_wallets(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit to return all wallets"),
+    after_id: Optional[int] = Query(None, description="Return wallets with an id greater than this cursor"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get monitored wallets with their current balances
+    
+    With limit set, results are paged by wallet id and the cursor for the
+    next page is returned in the X-Next-Cursor header.
+    """
+    wallets = await wallet_service.get_wallets_with_balances(db, limit=limit, after_id=after_id)
+    
+    if limit is not None and len(wallets) == limit:
+        response.headers["X-Next-Cursor"] = str(wallets[-1].id)
+    
+    return wallets
 
 @router.get("/wallets/{wallet_id}", response_model=WalletWithBalances)
 async def get_wallet(wallet_id: int, db: AsyncSession = Depends(get_db)):
@@ -105,6 +149,7 @@ async def delete_wallet(wallet_id: int, db: AsyncSession = Depends(get_db)):
     
     await db.delete(wallet)
     await db.commit()
+    invalidate_history_cache()
     
     # Send WebSocket notification
     await manager.broadcast({
@@ -127,23 +172,20 @@ async def create_wallet_legacy(wallet_data: LegacyWalletCreate, db: AsyncSession
     
     logger.info(f"POST /api/wallets/legacy called with data: {wallet_data}")
     
-    # Map blockchain name to ID
-    blockchain_result = await db.execute(
-        select(Blockchain).where(Blockchain.name == wallet_data.blockchain.upper())
-    )
-    blockchain = blockchain_result.scalar_one_or_none()
+    # Map blockchain name to ID, falling back to the database on a lookup miss
+    blockchain = BLOCKCHAINS_BY_NAME.get(wallet_data.blockchain.upper())
+    if blockchain is None:
+        blockchain_result = await db.execute(
+            select(Blockchain).where(Blockchain.name == wallet_data.blockchain.upper())
+        )
+        blockchain = blockchain_result.scalar_one_or_none()
+        if blockchain:
+            remember_blockchain(blockchain)
     
     if not blockchain:
         raise HTTPException(status_code=400, detail=f"Unsupported blockchain: {wallet_data.blockchain}")
     
-    # Create using new schema
-    new_wallet_data = WalletCreate(
-        address=wallet_data.address,
-        name=wallet_data.name,
-        blockchain_id=blockchain.id
-    )
-    
-    wallet = await create_wallet(new_wallet_data, db)
+    wallet = await add_wallet(wallet_data.address, wallet_data.name, blockchain, db)
     
     # Return in legacy format
     return LegacyWalletResponse(
@@ -2,57 +2,80 @@
 Simple cache implementation for WalletTrack
 Caches transaction data to improve response times
 """
+import asyncio
+import heapq
+import itertools
 import time
-from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Hashable, List, Optional, Tuple
 from datetime import datetime, timedelta
-import hashlib
-import json
 import logging
 
+import msgpack
+
 logger = logging.getLogger(__name__)
 
 class SimpleCache:
-    """Simple in-memory cache with TTL support"""
+    """
+    Simple in-memory cache with TTL support
+    
+    Values are stored msgpack-packed, so they must be plain JSON-like data
+    (dicts, lists, str, numbers, bool, None). Pass raw=True to store Python
+    objects as-is instead. At most maxsize entries are kept; the least
+    recently used one is evicted first.
+    """
     
-    def __init__(self, default_ttl: int = 30):
-        self.cache: Dict[str, Tuple[Any, float]] = {}
+    def __init__(self, default_ttl: int = 30, raw: bool = False, maxsize: int = 1024):
+        self.cache: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        # (expires_at, sequence, key); may hold stale entries, sequence breaks ties between keys
+        self.expiry_heap: List[Tuple[float, int, Hashable]] = []
+        self.sequence = itertools.count()
         self.default_ttl = default_ttl  # seconds
+        self.raw = raw
+        self.maxsize = maxsize
     
-    def _generate_key(self, prefix: str, **kwargs) -> str:
+    def _generate_key(self, prefix: str, **kwargs) -> Tuple:
         """Generate cache key from parameters"""
-        # Create a consistent key from parameters
-        params = json.dumps(kwargs, sort_keys=True)
-        key_hash = hashlib.md5(params.encode()).hexdigest()[:8]
-        return f"{prefix}:{key_hash}"
+        # Sorted items give a consistent, directly hashable key
+        return (prefix, *sorted(kwargs.items()))
     
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Hashable) -> Optional[Any]:
         """Get value from cache if not expired"""
-        if key in self.cache:
-            value, expires_at = self.cache[key]
+        entry = self.cache.get(key)
+        if entry is not None:
+            value, expires_at = entry
             if time.time() < expires_at:
                 logger.debug(f"Cache HIT: {key}")
-                return value
+                self.cache.move_to_end(key)
+                return value if self.raw else msgpack.unpackb(value, raw=False)
             else:
-                # Expired, remove from cache
-                del self.cache[key]
+                # Expired, remove from cache (pop: another caller may have already)
+                self.cache.pop(key, None)
                 logger.debug(f"Cache EXPIRED: {key}")
         
         logger.debug(f"Cache MISS: {key}")
         return None
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    def set(self, key: Hashable, value: Any, ttl: Optional[int] = None) -> None:
         """Set value in cache with TTL"""
         if ttl is None:
             ttl = self.default_ttl
         
+        if not self.raw:
+            value = msgpack.packb(value, use_bin_type=True)
+        
         expires_at = time.time() + ttl
         self.cache[key] = (value, expires_at)
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.maxsize:
+            # Its heap entry goes stale and is skipped by cleanup_expired
+            self.cache.popitem(last=False)
+        heapq.heappush(self.expiry_heap, (expires_at, next(self.sequence), key))
         logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
     
-    def delete(self, key: str) -> bool:
+    def delete(self, key: Hashable) -> bool:
         """Delete key from cache"""
-        if key in self.cache:
-            del self.cache[key]
+        if self.cache.pop(key, None) is not None:
             logger.debug(f"Cache DELETE: {key}")
             return True
         return False
@@ -60,21 +83,25 @@ class SimpleCache:
     def clear(self) -> None:
         """Clear all cache entries"""
         self.cache.clear()
-        logger.info("Cache cleared")
+        self.expiry_heap.clear()
+        # Debug level: history_cache is cleared on every balance write
+        logger.debug("Cache cleared")
     
     def cleanup_expired(self) -> None:
         """Remove expired entries from cache"""
         current_time = time.time()
-        expired_keys = [
-            key for key, (_, expires_at) in self.cache.items()
-            if current_time >= expires_at
-        ]
+        removed = 0
         
-        for key in expired_keys:
-            del self.cache[key]
+        # Pop only what has expired; heap entries superseded by a later set/delete are skipped
+        while self.expiry_heap and self.expiry_heap[0][0] <= current_time:
+            expires_at, _, key = heapq.heappop(self.expiry_heap)
+            entry = self.cache.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self.cache.pop(key, None)
+                removed += 1
         
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+        if removed:
+            logger.debug(f"Cleaned up {removed} expired cache entries")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -86,37 +113,134 @@ class SimpleCache:
             "total_entries": len(self.cache),
             "active_entries": active_entries,
             "expired_entries": expired_entries,
-            "memory_usage_kb": len(str(self.cache)) / 1024
+            # Packed sizes only; raw caches hold Python objects of unknown size
+            "memory_usage_kb": None if self.raw else sum(len(value) for value, _ in self.cache.values()) / 1024
         }
 
+class SingleFlightCache:
+    """Short-TTL in-memory cache that shares one in-flight fetch between concurrent callers"""
+    
+    def __init__(self, default_ttl: float = 0.25):
+        self.entries: Dict[Hashable, asyncio.Task] = {}
+        self.default_ttl = default_ttl  # seconds
+    
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached result for key, joining an in-flight fetch if there is one
+        
+        Args:
+            key: Hashable cache key
+            fetcher: Zero-argument callable returning the awaitable to run on a miss
+            ttl: Seconds to keep a successful result (default: default_ttl)
+        
+        Returns:
+            Result of the fetcher; None results and exceptions are not cached
+        """
+        task = self.entries.get(key)
+        if task is None:
+            logger.debug(f"Cache MISS: {key}")
+            task = asyncio.ensure_future(fetcher())
+            self.entries[key] = task
+            task.add_done_callback(
+                lambda done: self._schedule_expiry(key, done, self.default_ttl if ttl is None else ttl)
+            )
+        else:
+            logger.debug(f"Cache HIT: {key}")
+        
+        # Shield so a cancelled caller doesn't cancel the fetch shared with others
+        return await asyncio.shield(task)
+    
+    def _schedule_expiry(self, key: Hashable, task: asyncio.Task, ttl: float) -> None:
+        """Drop failed fetches immediately and successful ones after ttl"""
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            self._expire(key, task)
+        else:
+            asyncio.get_running_loop().call_later(ttl, self._expire, key, task)
+    
+    def _expire(self, key: Hashable, task: asyncio.Task) -> None:
+        """Remove key if it still points at the given task"""
+        if self.entries.get(key) is task:
+            del self.entries[key]
+    
+    def clear(self) -> None:
+        """Clear all cache entries"""
+        self.entries.clear()
+        logger.info("Cache cleared")
+
 # Global cache instances
 transaction_cache = SimpleCache(default_ttl=30)  # 30 seconds for transactions
 wallet_cache = SimpleCache(default_ttl=60)       # 60 seconds for wallets
 balance_cache = SimpleCache(default_ttl=45)      # 45 seconds for balances
+tokens_cache = SimpleCache(default_ttl=120)      # 2 minutes for the token catalogue
+blockchain_cache = SimpleCache(default_ttl=300)  # 5 minutes for supported blockchains
+status_cache = SimpleCache(default_ttl=15)       # 15 seconds for system status
+history_cache = SimpleCache(default_ttl=60, raw=True)  # 60 seconds for balance history responses (hold datetimes)
+orderbook_cache = SingleFlightCache(default_ttl=0.25)  # 250 ms for exchange orderbooks
 
-def get_transaction_cache_key(limit: int, hours: int) -> str:
+def get_transaction_cache_key(limit: int, hours: int) -> Tuple:
     """Generate cache key for transactions"""
     return transaction_cache._generate_key("transactions", limit=limit, hours=hours)
 
-def get_wallet_cache_key() -> str:
+def get_wallet_cache_key() -> Tuple:
     """Generate cache key for wallets"""
     return wallet_cache._generate_key("wallets")
 
-def get_balance_cache_key(wallet_address: str) -> str:
+def get_balance_cache_key(wallet_address: str) -> Tuple:
     """Generate cache key for wallet balance"""
     return balance_cache._generate_key("balance", address=wallet_address)
 
+async def run_cache_cleanup(interval: float = 10.0):
+    """Periodically drop expired entries from the global caches"""
+    while True:
+        await asyncio.sleep(interval)
+        for cache in (transaction_cache, wallet_cache, balance_cache, tokens_cache, blockchain_cache, status_cache, history_cache):
+            cache.cleanup_expired()
+
+def get_tokens_cache_key(blockchain_id: Optional[int], verified_only: bool) -> Tuple:
+    """Generate cache key for token listing"""
+    return tokens_cache._generate_key("tokens", blockchain_id=blockchain_id, verified_only=verified_only)
+
+def get_blockchain_cache_key() -> Tuple:
+    """Generate cache key for blockchains"""
+    return blockchain_cache._generate_key("blockchains")
+
+def get_status_cache_key(recent_bound: datetime) -> Tuple:
+    """Generate cache key for system status"""
+    return status_cache._generate_key("status", since=recent_bound)
+
+def get_wallet_history_cache_key(wallet_id: int, hours: int, days: int) -> Tuple:
+    """Generate cache key for a wallet's balance history"""
+    return history_cache._generate_key("wallet_history", wallet_id=wallet_id, hours=hours, days=days)
+
+def get_all_wallets_history_cache_key(days: int, hours: int) -> Tuple:
+    """Generate cache key for the all-wallets balance history"""
+    return history_cache._generate_key("all_wallets_history", days=days, hours=hours)
+
+def invalidate_history_cache():
+    """Clear balance history caches after balances or history rows change"""
+    history_cache.clear()
+
 def invalidate_all_caches():
     """Clear all caches - use when major data changes occur"""
     transaction_cache.clear()
     wallet_cache.clear()
     balance_cache.clear()
+    tokens_cache.clear()
+    blockchain_cache.clear()
+    status_cache.clear()
+    history_cache.clear()
     logger.info("🗑️ All caches invalidated")
 
 def invalidate_wallet_related_caches():
     """Clear wallet and transaction caches when balance updates"""
     wallet_cache.clear()
     transaction_cache.clear()
+    status_cache.clear()
     logger.info("🗑️ Wallet and transaction caches invalidated")
 
 def invalidate_transaction_cache():
@@ -49,4 +49,3 @@ COINTR_STREAM_URL = os.getenv("COINTR_STREAM_URL", "wss://api.cointr.com/ws")
 # OKX API Configuration
 OKX_BASE_URL = os.getenv("OKX_BASE_URL", "https://www.okx.com")
 OKX_STREAM_URL = os.getenv("OKX_STREAM_URL", "wss://ws.okx.com:8443/ws/v5/public")
-COINTR_STREAM_URL = os.getenv("COINTR_STREAM_URL", "wss://api.cointr.com/ws")
@@ -1,11 +1,15 @@
 """
 Core dependencies and utilities
 """
+import asyncio
+import contextlib
 import logging
 from contextlib import asynccontextmanager
+from typing import Dict
 from fastapi import FastAPI
+from sqlalchemy import select
 
-from database import init_db, seed_initial_data, AsyncSessionLocal
+from database import init_db, seed_initial_data, AsyncSessionLocal, Blockchain
 from tron_monitor import tron_monitor
 from eth_monitor import ethereum_monitor
 from btc_monitor import btc_monitor
@@ -15,6 +19,7 @@ from tron_service import tron_client
 from btc_service import btc_client
 from solana_service import solana_client
 from websocket_manager import manager
+from app.core.cache import run_cache_cleanup
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -24,23 +29,54 @@ logger = logging.getLogger(__name__)
 eth_service = EthereumService(use_v2_api=True)
 tron_service = tron_client  # Alias for backward compatibility
 
+# Blockchain rows are seeded once and never change; loaded at startup
+BLOCKCHAINS_BY_ID: Dict[int, Blockchain] = {}
+BLOCKCHAINS_BY_NAME: Dict[str, Blockchain] = {}
+
+def remember_blockchain(blockchain: Blockchain) -> None:
+    """Add a blockchain row to the in-memory lookup maps"""
+    BLOCKCHAINS_BY_ID[blockchain.id] = blockchain
+    BLOCKCHAINS_BY_NAME[blockchain.name] = blockchain
+
+async def load_blockchains() -> None:
+    """Load all blockchain rows into the in-memory lookup maps"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Blockchain))
+        for blockchain in result.scalars().all():
+            remember_blockchain(blockchain)
+    logger.info(f"Loaded {len(BLOCKCHAINS_BY_ID)} blockchains")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
+    # Imported here: the exchange services import this module for the logger
+    from app.services.binance_service import binance_service
+    from app.services.cointr_service import cointr_service
+    from app.services.whitebit_service import whitebit_service
+    from app.services.okx_service import okx_service
+    
     # Startup
     logger.info("Starting Multi-Blockchain Wallet Monitor...")
     await init_db()
     await seed_initial_data()
+    await load_blockchains()
+    await binance_service.startup()
     await tron_monitor.start_monitoring()
     await ethereum_monitor.start_monitoring()
     await btc_monitor.start_monitoring()
     await solana_monitor.start_monitoring()
+    cache_cleanup_task = asyncio.create_task(run_cache_cleanup())
+    binance_keep_warm_task = asyncio.create_task(binance_service.keep_warm())
     logger.info("Application started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Wallet Monitor...")
+    for background_task in (cache_cleanup_task, binance_keep_warm_task):
+        background_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await background_task
     await tron_monitor.stop_monitoring()
     await ethereum_monitor.stop_monitoring()
     await btc_monitor.stop_monitoring()
@@ -49,4 +85,6 @@ async def lifespan(app: FastAPI):
     await tron_client.close()
     await btc_client.close()
     await solana_client.close()
+    for exchange_service in (binance_service, cointr_service, whitebit_service, okx_service):
+        await exchange_service.close()
     logger.info("Application shutdown complete")
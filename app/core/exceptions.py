@@ -0,0 +1,13 @@
+"""
+Application exception types
+Handled once at the app level instead of per route
+"""
+
+class UpstreamError(Exception):
+    """Raised when an upstream exchange API returns no usable data"""
+
+    def __init__(self, exchange: str, resource: str, symbol: str):
+        self.exchange = exchange
+        self.resource = resource
+        self.symbol = symbol
+        super().__init__(f"Failed to fetch {exchange} {resource} for {symbol}")
@@ -1,32 +1,49 @@
 """
 Balance service - handles balance and history-related business logic
 """
-from typing import List
+from collections import defaultdict
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 from fastapi import HTTPException
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, func, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, raiseload, contains_eager
 
 from database import (
     Blockchain, Token, Wallet, WalletToken, BalanceHistory
 )
 from app.core.dependencies import eth_service, logger
 from app.core.config import CHANGE_THRESHOLD, MIN_CHANGE_AMOUNT
+from app.core.cache import (
+    history_cache, get_wallet_history_cache_key, get_all_wallets_history_cache_key,
+    invalidate_history_cache
+)
 from websocket_manager import manager
 
 class BalanceService:
+    """
+    Balance reads and writes
+    
+    Read queries eagerly load the relationships they use and add raiseload("*"),
+    so an unplanned lazy load raises instead of issuing one query per row.
+    """
 
     async def get_wallet_balance_history(
         self, db: AsyncSession, wallet_id: int, hours: int = 24, days: int = 7
     ):
         """Get balance history for a wallet with enhanced data"""
         
+        cache_key = get_wallet_history_cache_key(wallet_id, hours, days)
+        cached_history = history_cache.get(cache_key)
+        if cached_history is not None:
+            return cached_history
+        
         # Verify wallet exists
         wallet_result = await db.execute(
             select(Wallet)
-            .options(selectinload(Wallet.blockchain_ref))
+            .options(selectinload(Wallet.blockchain_ref), raiseload("*"))
             .where(Wallet.id == wallet_id)
         )
         wallet = wallet_result.scalar_one_or_none()
@@ -42,7 +59,8 @@ class BalanceService:
         # Get balance history records
         history_result = await db.execute(
             select(BalanceHistory)
-            .options(selectinload(BalanceHistory.token))
+            .join(BalanceHistory.token)
+            .options(contains_eager(BalanceHistory.token), raiseload("*"))
             .where(
                 and_(
                     BalanceHistory.wallet_id == wallet_id,
@@ -58,7 +76,7 @@ class BalanceService:
         # Get current balances as the latest data point
         current_result = await db.execute(
             select(WalletToken)
-            .options(selectinload(WalletToken.token))
+            .options(selectinload(WalletToken.token), raiseload("*"))
             .where(WalletToken.wallet_id == wallet_id)
         )
         
@@ -66,8 +84,10 @@ class BalanceService:
         
         # Organize data by token for time series
         token_histories = {}
+        # Tokens whose data points gained a current balance and need re-sorting
+        merged_symbols = set()
         
-        # Add historical data
+        # Add historical data (already newest first from the query, so each token's list stays sorted)
         for record in history_records:
             token_symbol = record.token.symbol
             if token_symbol not in token_histories:
@@ -79,7 +99,7 @@ class BalanceService:
                 }
             
             token_histories[token_symbol]["data_points"].append({
-                "timestamp": record.timestamp.isoformat(),
+                "timestamp": record.timestamp,
                 "balance_before": record.balance_before,
                 "balance_after": record.balance_after,
                 "change_amount": record.change_amount,
@@ -100,9 +120,10 @@ class BalanceService:
                         "data_points": []
                     }
                 
-                # Add current balance as latest point
-                token_histories[token_symbol]["data_points"].insert(0, {
-                    "timestamp": current_balance.last_updated.isoformat(),
+                # Add current balance point; the sort below moves it into place
+                merged_symbols.add(token_symbol)
+                token_histories[token_symbol]["data_points"].append({
+                    "timestamp": current_balance.last_updated,
                     "balance_before": current_balance.balance,
                     "balance_after": current_balance.balance,
                     "change_amount": 0,
@@ -111,21 +132,21 @@ class BalanceService:
                     "transaction_hash": None
                 })
         
-        # Sort data points by timestamp for each token
-        for token_data in token_histories.values():
-            token_data["data_points"].sort(key=lambda x: x["timestamp"], reverse=True)
+        # Sort data points by timestamp, only for tokens a current balance was merged into
+        for token_symbol in merged_symbols:
+            token_histories[token_symbol]["data_points"].sort(key=itemgetter("timestamp"), reverse=True)
         
         # Create summary statistics
         total_tokens = len(token_histories)
         total_changes = sum(len(token_data["data_points"]) for token_data in token_histories.values())
         
-        return {
+        wallet_history = {
             "wallet_id": wallet_id,
             "wallet_address": wallet.address,
             "wallet_name": wallet.name,
             "blockchain": wallet.blockchain_ref.name,
             "time_range": {
-                "since": since.isoformat(),
+                "since": since,
                 "hours": hours if days == 0 else days * 24,
                 "days": days
             },
@@ -136,52 +157,81 @@ class BalanceService:
             },
             "token_histories": list(token_histories.values())
         }
+        
+        history_cache.set(cache_key, wallet_history)
+        return wallet_history
 
     async def get_all_wallets_history(self, db: AsyncSession, days: int = 7, hours: int = 0):
         """Get balance history for all wallets"""
+        cache_key = get_all_wallets_history_cache_key(days, hours)
+        cached_history = history_cache.get(cache_key)
+        if cached_history is not None:
+            return cached_history
+        
         try:
             # Get all active wallets
             wallets_result = await db.execute(
                 select(Wallet)
-                .options(selectinload(Wallet.blockchain_ref))
+                .options(selectinload(Wallet.blockchain_ref), raiseload("*"))
                 .where(Wallet.is_active == True)
             )
             wallets = wallets_result.scalars().all()
             
-            all_histories = []
+            wallet_ids = [wallet.id for wallet in wallets]
             
-            # Get history for each wallet
-            for wallet in wallets:
-                # Calculate time range
-                if days > 0:
-                    since = datetime.utcnow() - timedelta(days=days)
-                else:
-                    since = datetime.utcnow() - timedelta(hours=hours or 24)
-                
-                # Get balance history for this wallet
-                history_result = await db.execute(
-                    select(BalanceHistory)
-                    .options(selectinload(BalanceHistory.token))
-                    .where(
-                        and_(
-                            BalanceHistory.wallet_id == wallet.id,
-                            BalanceHistory.timestamp >= since
-                        )
+            # Calculate time range
+            if days > 0:
+                since = datetime.utcnow() - timedelta(days=days)
+            else:
+                since = datetime.utcnow() - timedelta(hours=hours or 24)
+            
+            # Latest 100 history records per wallet, for all wallets in one query
+            ranked_history = (
+                select(
+                    BalanceHistory.id,
+                    func.row_number().over(
+                        partition_by=BalanceHistory.wallet_id,
+                        order_by=BalanceHistory.timestamp.desc()
+                    ).label("row_number")
+                )
+                .where(
+                    and_(
+                        BalanceHistory.wallet_id.in_(wallet_ids),
+                        BalanceHistory.timestamp >= since
                     )
-                    .order_by(BalanceHistory.timestamp.desc())
-                    .limit(100)
                 )
-                
-                history_records = history_result.scalars().all()
-                
-                # Get current balances
-                current_result = await db.execute(
-                    select(WalletToken)
-                    .options(selectinload(WalletToken.token))
-                    .where(WalletToken.wallet_id == wallet.id)
+                .subquery()
+            )
+            history_result = await db.execute(
+                select(BalanceHistory)
+                .join(ranked_history, BalanceHistory.id == ranked_history.c.id)
+                .join(BalanceHistory.token)
+                .options(contains_eager(BalanceHistory.token), raiseload("*"))
+                .where(ranked_history.c.row_number <= 100)
+                .order_by(BalanceHistory.wallet_id, BalanceHistory.timestamp.desc())
+            )
+            
+            history_by_wallet = defaultdict(list)
+            for record in history_result.scalars().all():
+                history_by_wallet[record.wallet_id].append(record)
+            
+            # Count of positive balances per wallet
+            current_result = await db.execute(
+                select(WalletToken.wallet_id, func.count(WalletToken.id))
+                .where(
+                    and_(
+                        WalletToken.wallet_id.in_(wallet_ids),
+                        WalletToken.balance > 0
+                    )
                 )
-                
-                current_balances = current_result.scalars().all()
+                .group_by(WalletToken.wallet_id)
+            )
+            current_tokens_by_wallet = dict(current_result.all())
+            
+            all_histories = []
+            
+            for wallet in wallets:
+                history_records = history_by_wallet.get(wallet.id, [])
                 
                 # Format wallet history
                 wallet_history = {
@@ -189,7 +239,7 @@ class BalanceService:
                     "wallet_address": wallet.address,
                     "wallet_name": wallet.name,
                     "blockchain": wallet.blockchain_ref.name,
-                    "current_tokens": len([b for b in current_balances if b.balance > 0]),
+                    "current_tokens": current_tokens_by_wallet.get(wallet.id, 0),
                     "total_changes": len(history_records),
                     "recent_changes": []
                 }
@@ -197,7 +247,7 @@ class BalanceService:
                 # Add recent balance changes
                 for record in history_records[:10]:  # Last 10 changes
                     wallet_history["recent_changes"].append({
-                        "timestamp": record.timestamp.isoformat(),
+                        "timestamp": record.timestamp,
                         "token_symbol": record.token.symbol,
                         "balance_before": record.balance_before,
                         "balance_after": record.balance_after,
@@ -208,7 +258,7 @@ class BalanceService:
                 
                 all_histories.append(wallet_history)
             
-            return {
+            all_wallets_history = {
                 "period": f"{days} days" if days > 0 else f"{hours or 24} hours",
                 "total_wallets": len(wallets),
                 "summary": {
@@ -220,6 +270,9 @@ class BalanceService:
                 "wallets": all_histories
             }
             
+            history_cache.set(cache_key, all_wallets_history)
+            return all_wallets_history
+            
         except Exception as e:
             logger.error(f"Error getting all wallets history: {e}")
             raise HTTPException(status_code=500, detail="Error fetching wallet histories")
@@ -235,20 +288,25 @@ class BalanceService:
             if not blockchain:
                 return
             
-            for token_symbol, balance in balances.items():
-                if balance <= 0:
-                    continue
-                    
-                # Find existing token
-                token_result = await db.execute(
-                    select(Token).where(
-                        and_(
-                            Token.symbol == token_symbol,
-                            Token.blockchain_id == blockchain.id
-                        )
+            positive_balances = {symbol: balance for symbol, balance in balances.items() if balance > 0}
+            
+            # Load all existing tokens for these symbols in one query
+            token_result = await db.execute(
+                select(Token).where(
+                    and_(
+                        Token.symbol.in_(list(positive_balances)),
+                        Token.blockchain_id == blockchain.id
                     )
                 )
-                token = token_result.scalar_one_or_none()
+            )
+            tokens_by_symbol = {}
+            for token in token_result.scalars():
+                tokens_by_symbol.setdefault(token.symbol, token)
+            
+            token_balances = []
+            new_tokens = False
+            for token_symbol, balance in positive_balances.items():
+                token = tokens_by_symbol.get(token_symbol)
                 
                 if not token:
                     # Create basic token record
@@ -259,27 +317,37 @@ class BalanceService:
                         is_verified=eth_service.is_legitimate_token(token_symbol) if blockchain_name == "ETH" else True
                     )
                     db.add(token)
-                    await db.flush()
+                    new_tokens = True
                 
-                # Update or create wallet token balance
-                await self.update_single_wallet_token(db, wallet_id, token.id, balance)
+                token_balances.append((token, balance))
+            
+            # One flush assigns ids to all newly created tokens
+            if new_tokens:
+                await db.flush()
             
-            # Update wallet last_updated
-            wallet_result = await db.execute(select(Wallet).where(Wallet.id == wallet_id))
-            wallet = wallet_result.scalar_one_or_none()
-            if wallet:
-                wallet.last_updated = datetime.utcnow()
+            # Update or create wallet token balances
+            await self.apply_wallet_token_balances(db, wallet_id, token_balances)
+            
+            # Update wallet last_updated without loading the row
+            await db.execute(
+                update(Wallet)
+                .where(Wallet.id == wallet_id)
+                .values(last_updated=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
             
             await db.commit()
+            invalidate_history_cache()
             
-            # Send WebSocket notification
-            await manager.broadcast({
-                "type": "balance_update",
-                "data": {
-                    "wallet_id": wallet_id,
-                    "balances": balances
-                }
-            })
+            # Send WebSocket notification without holding up the caller
+            if manager.active_count > 0:
+                manager.broadcast_in_background({
+                    "type": "balance_update",
+                    "data": {
+                        "wallet_id": wallet_id,
+                        "balances": balances
+                    }
+                })
             
         except Exception as e:
             await db.rollback()
@@ -301,38 +369,41 @@ class BalanceService:
             # Create a mapping of token symbols to their detailed info
             token_info_map = {token_info['symbol']: token_info for token_info in token_info_list}
             
-            for token_symbol, balance in balances.items():
-                if balance <= 0:
-                    continue
-                    
+            positive_balances = {symbol: balance for symbol, balance in balances.items() if balance > 0}
+            contracts = [
+                token_info_map[symbol]['contract'] for symbol in positive_balances
+                if token_info_map.get(symbol, {}).get('contract')
+            ]
+            
+            # Load every candidate token once, matched by symbol or contract address
+            token_result = await db.execute(
+                select(Token).where(
+                    and_(
+                        Token.blockchain_id == blockchain.id,
+                        or_(Token.symbol.in_(list(positive_balances)), Token.contract_address.in_(contracts))
+                    )
+                )
+            )
+            tokens_by_symbol = {}
+            tokens_by_contract = {}
+            for token in token_result.scalars():
+                tokens_by_symbol.setdefault(token.symbol, token)
+                if token.contract_address:
+                    tokens_by_contract.setdefault(token.contract_address, token)
+            
+            token_balances = []
+            new_tokens = False
+            for token_symbol, balance in positive_balances.items():
                 # Get detailed token info
                 token_info = token_info_map.get(token_symbol, {})
                 contract_address = token_info.get('contract')
                 token_name = token_info.get('name', token_symbol)
                 decimals = token_info.get('decimals', 18)
                 
-                # Find existing token by symbol and blockchain first
-                token_result = await db.execute(
-                    select(Token).where(
-                        and_(
-                            Token.symbol == token_symbol,
-                            Token.blockchain_id == blockchain.id
-                        )
-                    )
-                )
-                token = token_result.scalar_one_or_none()
-                
-                # If not found and we have contract address, try to find by contract
+                # Find existing token by symbol first, then by contract address
+                token = tokens_by_symbol.get(token_symbol)
                 if not token and contract_address:
-                    token_result = await db.execute(
-                        select(Token).where(
-                            and_(
-                                Token.contract_address == contract_address,
-                                Token.blockchain_id == blockchain.id
-                            )
-                        )
-                    )
-                    token = token_result.scalar_one_or_none()
+                    token = tokens_by_contract.get(contract_address)
                 
                 if not token:
                     # Create new token with detailed information
@@ -347,7 +418,10 @@ class BalanceService:
                         is_verified=eth_service.is_legitimate_token(token_symbol, contract_address) if blockchain_name == "ETH" else True
                     )
                     db.add(token)
-                    await db.flush()
+                    tokens_by_symbol[token_symbol] = token
+                    if contract_address:
+                        tokens_by_contract.setdefault(contract_address, token)
+                    new_tokens = True
                 else:
                     # Update existing token with missing information
                     if not token.contract_address and contract_address:
@@ -357,71 +431,101 @@ class BalanceService:
                     if token.decimals == 18 and decimals != 18:
                         token.decimals = decimals
                 
-                # Update wallet token balance
-                await self.update_single_wallet_token(db, wallet_id, token.id, balance)
+                token_balances.append((token, balance))
+            
+            # One flush assigns ids to all newly created tokens
+            if new_tokens:
+                await db.flush()
             
-            # Update wallet last_updated
-            wallet_result = await db.execute(select(Wallet).where(Wallet.id == wallet_id))
-            wallet = wallet_result.scalar_one_or_none()
-            if wallet:
-                wallet.last_updated = datetime.utcnow()
+            await self.apply_wallet_token_balances(db, wallet_id, token_balances)
+            
+            # Update wallet last_updated without loading the row
+            await db.execute(
+                update(Wallet)
+                .where(Wallet.id == wallet_id)
+                .values(last_updated=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
             
             await db.commit()
+            invalidate_history_cache()
             
-            # Send WebSocket notification
-            await manager.broadcast({
-                "type": "balance_update",
-                "data": {
-                    "wallet_id": wallet_id,
-                    "balances": balances
-                }
-            })
+            # Send WebSocket notification without holding up the caller
+            if manager.active_count > 0:
+                manager.broadcast_in_background({
+                    "type": "balance_update",
+                    "data": {
+                        "wallet_id": wallet_id,
+                        "balances": balances
+                    }
+                })
             
         except Exception as e:
             await db.rollback()
             logger.error(f"Error updating wallet balances with tokens: {e}")
 
-    async def update_single_wallet_token(self, db: AsyncSession, wallet_id: int, token_id: int, balance: float):
-        """Update a single wallet token balance and create history if significant change"""
+    async def apply_wallet_token_balances(self, db: AsyncSession, wallet_id: int, token_balances: List[Tuple[Token, float]]):
+        """
+        Set many wallet token balances with one SELECT and at most one bulk INSERT
         
-        # Find existing wallet token balance
+        Args:
+            db: Database session
+            wallet_id: Wallet the balances belong to
+            token_balances: (token, balance) pairs; tokens must already have ids
+        """
+        # Load the wallet's current balances once; new ones are inserted in bulk below
         wallet_token_result = await db.execute(
-            select(WalletToken).where(
-                and_(
-                    WalletToken.wallet_id == wallet_id,
-                    WalletToken.token_id == token_id
-                )
-            )
+            select(WalletToken).where(WalletToken.wallet_id == wallet_id)
         )
-        wallet_token = wallet_token_result.scalar_one_or_none()
+        wallet_tokens = {wallet_token.token_id: wallet_token for wallet_token in wallet_token_result.scalars()}
+        new_wallet_tokens = {}
+        history_rows = []
         
-        if wallet_token:
-            # Update existing balance
-            old_balance = wallet_token.balance
-            wallet_token.balance = balance
-            wallet_token.last_updated = datetime.utcnow()
+        for token, balance in token_balances:
+            wallet_token = wallet_tokens.get(token.id)
+            if wallet_token:
+                history_row = self.apply_wallet_token_balance(wallet_token, balance)
+                if history_row:
+                    history_rows.append(history_row)
+            else:
+                new_wallet_tokens[token.id] = {
+                    "wallet_id": wallet_id,
+                    "token_id": token.id,
+                    "balance": balance,
+                    "last_updated": datetime.utcnow()
+                }
+        
+        if new_wallet_tokens:
+            await db.execute(insert(WalletToken), list(new_wallet_tokens.values()))
+        
+        # All significant changes in one executemany insert
+        if history_rows:
+            await db.execute(insert(BalanceHistory), history_rows)
+
+    def apply_wallet_token_balance(self, wallet_token: WalletToken, balance: float) -> Optional[Dict]:
+        """
+        Update an existing wallet token balance
+        
+        Returns:
+            BalanceHistory column values if the change is significant, otherwise None
+        """
+        old_balance = wallet_token.balance
+        wallet_token.balance = balance
+        wallet_token.last_updated = datetime.utcnow()
+        
+        # Create history record for significant changes
+        change_amount = balance - old_balance
+        if (old_balance > 0 and 
+            abs(change_amount) > MIN_CHANGE_AMOUNT and
+            abs(change_amount) / old_balance > CHANGE_THRESHOLD):
             
-            # Create history record for significant changes
-            if (old_balance > 0 and 
-                abs(balance - old_balance) > MIN_CHANGE_AMOUNT and
-                abs(balance - old_balance) / old_balance > CHANGE_THRESHOLD):
-                
-                history = BalanceHistory(
-                    wallet_id=wallet_id,
-                    token_id=token_id,
-                    balance_before=old_balance,
-                    balance_after=balance,
-                    change_amount=balance - old_balance,
-                    change_percentage=((balance - old_balance) / old_balance) * 100 if old_balance > 0 else None,
-                    change_type='increase' if balance > old_balance else 'decrease'
-                )
-                db.add(history)
-        else:
-            # Create new balance record
-            wallet_token = WalletToken(
-                wallet_id=wallet_id,
-                token_id=token_id,
-                balance=balance,
-                last_updated=datetime.utcnow()
-            )
-            db.add(wallet_token)
+            return {
+                "wallet_id": wallet_token.wallet_id,
+                "token_id": wallet_token.token_id,
+                "balance_before": old_balance,
+                "balance_after": balance,
+                "change_amount": change_amount,
+                "change_percentage": (change_amount / old_balance) * 100,
+                "change_type": 'increase' if change_amount > 0 else 'decrease'
+            }
+        return None
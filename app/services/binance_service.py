@@ -2,43 +2,84 @@
 Binance API service for orderbook data
 """
 import asyncio
-import aiohttp
-import json
+import httpx
 import ssl
+import orjson
 from typing import Dict, List, Optional
 from app.core.config import BINANCE_BASE_URL, BINANCE_COMMISSION_BPS, KDV_RATE
 from app.core.dependencies import logger
+from app.core.cache import SingleFlightCache
+
+# Seconds to share a successful response between concurrent/repeated callers
+TICKER_PRICE_CACHE_TTL = 2.0
+TICKER_24H_CACHE_TTL = 10.0
+
+# Seconds get_ticker_price waits to collect other symbols into one batched request
+TICKER_BATCH_WINDOW = 0.02
+
+# Seconds between pings keeping a pooled connection open; below the 75s keepalive_expiry
+KEEP_WARM_INTERVAL = 60.0
+
+# Verifying context built once and shared by every client, so TLS sessions can resume across reconnects
+SSL_CONTEXT = ssl.create_default_context()
 
 class BinanceService:
     def __init__(self):
         self.base_url = BINANCE_BASE_URL
+        # Endpoint URLs parsed once; httpx reuses URL instances without re-parsing them
+        self.depth_url = httpx.URL(f"{self.base_url}/api/v3/depth")
+        self.ticker_price_url = httpx.URL(f"{self.base_url}/api/v3/ticker/price")
+        self.book_ticker_url = httpx.URL(f"{self.base_url}/api/v3/ticker/bookTicker")
+        self.exchange_info_url = httpx.URL(f"{self.base_url}/api/v3/exchangeInfo")
+        self.ticker_24h_url = httpx.URL(f"{self.base_url}/api/v3/ticker/24hr")
+        self.klines_url = httpx.URL(f"{self.base_url}/api/v3/klines")
+        self.ping_url = httpx.URL(f"{self.base_url}/api/v3/ping")
         self.commission_bps = BINANCE_COMMISSION_BPS
         self.kdv_rate = KDV_RATE
-        self.session: Optional[aiohttp.ClientSession] = None
+        # Fee rates are fixed at startup, so the per-price arithmetic is precomputed
+        self.commission_rate = self.commission_bps / 10000
+        self.fee_rate = self.commission_rate * (1 + self.kdv_rate)
+        self.client: Optional[httpx.AsyncClient] = None
+        self.cache = SingleFlightCache()
+        # Symbols waiting for the next batched ticker price request
+        self.pending_prices: Dict[str, asyncio.Future] = {}
+        self.price_batch_task: Optional[asyncio.Task] = None
     
-    async def get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            # Create SSL context that doesn't verify certificates
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10),
-                connector=connector
+    async def get_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP/2 client"""
+        if self.client is None or self.client.is_closed:
+            # HTTP/2 multiplexes concurrent calls over one keep-alive TLS connection
+            self.client = httpx.AsyncClient(
+                http2=True,
+                verify=SSL_CONTEXT,
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=75)
             )
-        return self.session
+        return self.client
+    
+    async def startup(self):
+        """Create the client up front so request paths can use it without a liveness check"""
+        await self.get_client()
+    
+    async def keep_warm(self, interval: float = KEEP_WARM_INTERVAL):
+        """Periodically ping Binance so an idle pool keeps a live TLS connection"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                client = self.client or await self.get_client()
+                await client.get(self.ping_url)
+            except Exception as e:
+                logger.warning(f"⚠️ Binance keep-warm ping failed: {str(e)}")
     
     async def close(self):
-        """Close the aiohttp session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Close the HTTP client"""
+        if self.client and not self.client.is_closed:
+            await self.client.aclose()
+        self.client = None
     
     def calculate_commission(self, amount: float) -> float:
         """Calculate commission from amount using bps"""
-        return amount * (self.commission_bps / 10000)
+        return amount * self.commission_rate
     
     def calculate_kdv(self, commission: float) -> float:
         """Calculate KDV from commission"""
@@ -46,16 +87,15 @@ class BinanceService:
     
     def calculate_net_price(self, price: float, amount: float) -> Dict[str, float]:
         """Calculate all price components"""
-        commission = self.calculate_commission(amount)
-        kdv = self.calculate_kdv(commission)
-        net_price = price - commission - kdv
+        commission = amount * self.commission_rate
+        total_fees = amount * self.fee_rate
         
         return {
             "raw_price": price,
             "commission": commission,
-            "kdv": kdv,
-            "net_price": net_price,
-            "total_fees": commission + kdv
+            "kdv": commission * self.kdv_rate,
+            "net_price": price - total_fees,
+            "total_fees": total_fees
         }
     
     async def get_orderbook(self, symbol: str = "USDTTRY", limit: int = 20) -> Optional[Dict]:
@@ -69,34 +109,35 @@ class BinanceService:
         Returns:
             Dict with bids and asks or None if error
         """
+        # Concurrent callers are coalesced by the route-level orderbook_cache
         try:
-            session = await self.get_session()
+            client = self.client or await self.get_client()
             
-            url = f"{self.base_url}/api/v3/depth"
+            url = self.depth_url
             params = {
                 "symbol": symbol.upper(),
                 "limit": limit
             }
             
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
                     
-                    # Convert to our format and take first 8 levels
-                    orderbook = {
-                        "bids": [[float(price), float(qty)] for price, qty in data["bids"][:8]],
-                        "asks": [[float(price), float(qty)] for price, qty in data["asks"][:8]],
-                        "symbol": symbol,
-                        "lastUpdateId": data.get("lastUpdateId"),
-                        "exchange": "binance"
-                    }
+                # Convert to our format and take first 8 levels
+                orderbook = {
+                    "bids": [[float(price), float(qty)] for price, qty in data["bids"][:8]],
+                    "asks": [[float(price), float(qty)] for price, qty in data["asks"][:8]],
+                    "symbol": symbol,
+                    "lastUpdateId": data.get("lastUpdateId"),
+                    "exchange": "binance"
+                }
                     
-                    return orderbook
-                else:
-                    logger.error(f"❌ Binance API error: {response.status}")
-                    return None
+                return orderbook
+            else:
+                logger.error(f"❌ Binance API error: {response.status_code}")
+                return None
                     
-        except asyncio.TimeoutError:
+        except httpx.TimeoutException:
             logger.error("⏰ Binance API timeout")
             return None
         except Exception as e:
@@ -113,26 +154,137 @@ class BinanceService:
         Returns:
             Current price or None if error
         """
+        return await self.cache.get_or_fetch(
+            ("price", symbol.upper()),
+            lambda: self.queue_ticker_price(symbol.upper()),
+            TICKER_PRICE_CACHE_TTL
+        )
+    
+    async def queue_ticker_price(self, symbol: str) -> Optional[float]:
+        """Wait for symbol's price from the next batched ticker price request"""
+        future = self.pending_prices.get(symbol)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.pending_prices[symbol] = future
+            if self.price_batch_task is None:
+                self.price_batch_task = asyncio.create_task(self.flush_ticker_prices())
+        return await future
+    
+    async def flush_ticker_prices(self):
+        """Fetch every queued symbol's price in one request and resolve the waiting callers"""
+        pending = None
+        prices = {}
+        error = None
         try:
-            session = await self.get_session()
+            await asyncio.sleep(TICKER_BATCH_WINDOW)
+            pending, self.pending_prices = self.pending_prices, {}
+            self.price_batch_task = None
             
-            url = f"{self.base_url}/api/v3/ticker/price"
-            params = {"symbol": symbol.upper()}
+            symbols = list(pending)
+            batch_prices = await self.get_ticker_prices(symbols) if len(symbols) > 1 else None
+            if batch_prices is None:
+                # Single symbol, or the batch was rejected (one unknown symbol fails the whole request)
+                results = await asyncio.gather(*map(self.fetch_ticker_price, symbols))
+                batch_prices = dict(zip(symbols, results))
+            prices = batch_prices
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if pending is None:
+                # Cancelled or failed before the batch was taken; release everyone queued so far
+                pending, self.pending_prices = self.pending_prices, {}
+                self.price_batch_task = None
             
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    price = float(data["price"])
-                    logger.info(f"📊 Binance {symbol} price: {price}")
-                    return price
+            # Never leave a caller waiting: a failure is passed on, cancellation resolves to None
+            for symbol, future in pending.items():
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
                 else:
-                    logger.error(f"❌ Binance ticker API error: {response.status}")
-                    return None
+                    future.set_result(prices.get(symbol))
+    
+    async def get_ticker_prices(self, symbols: List[str]) -> Optional[Dict[str, float]]:
+        """
+        Get current prices for many symbols in a single request
+        
+        Args:
+            symbols: Trading pair symbols
+            
+        Returns:
+            Dict of price keyed by symbol or None if error
+        """
+        try:
+            client = self.client or await self.get_client()
+            
+            url = self.ticker_price_url
+            params = {"symbols": orjson.dumps([symbol.upper() for symbol in symbols]).decode()}
+            
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                return {ticker["symbol"]: float(ticker["price"]) for ticker in data}
+            else:
+                logger.error(f"❌ Binance ticker prices API error: {response.status_code}")
+                return None
+                    
+        except Exception as e:
+            logger.error(f"💥 Binance ticker prices error: {str(e)}")
+            return None
+    
+    async def fetch_ticker_price(self, symbol: str) -> Optional[float]:
+        """Fetch current price for a symbol, bypassing the cache"""
+        try:
+            client = self.client or await self.get_client()
+            
+            url = self.ticker_price_url
+            params = {"symbol": symbol.upper()}
+            
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                price = float(data["price"])
+                logger.info(f"📊 Binance {symbol} price: {price}")
+                return price
+            else:
+                logger.error(f"❌ Binance ticker API error: {response.status_code}")
+                return None
                     
         except Exception as e:
             logger.error(f"💥 Binance ticker error: {str(e)}")
             return None
     
+    async def get_book_tickers(self, symbols: Optional[List[str]] = None) -> Optional[Dict[str, Dict]]:
+        """
+        Get best bid/ask for many symbols in a single request
+        
+        Args:
+            symbols: Optional symbol filter, if None returns all symbols
+            
+        Returns:
+            Dict of book ticker data keyed by symbol or None if error
+        """
+        try:
+            client = self.client or await self.get_client()
+            
+            url = self.book_ticker_url
+            params = {}
+            if symbols:
+                params["symbols"] = orjson.dumps([symbol.upper() for symbol in symbols]).decode()
+            
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                return {ticker["symbol"]: ticker for ticker in data}
+            else:
+                logger.error(f"❌ Binance bookTicker API error: {response.status_code}")
+                return None
+                    
+        except Exception as e:
+            logger.error(f"💥 Binance bookTicker error: {str(e)}")
+            return None
+    
     async def get_all_symbols(self) -> Optional[List[Dict]]:
         """
         Get all trading symbols from Binance
@@ -140,20 +292,21 @@ class BinanceService:
         Returns:
             List of symbol information or None if error
         """
+        # Cached, together with the coins derived from it, by the exchange analytics listings
         try:
-            session = await self.get_session()
+            client = self.client or await self.get_client()
             
-            url = f"{self.base_url}/api/v3/exchangeInfo"
+            url = self.exchange_info_url
             
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    symbols = data.get("symbols", [])
-                    logger.info(f"📋 Binance: {len(symbols)} symbols loaded")
-                    return symbols
-                else:
-                    logger.error(f"❌ Binance exchangeInfo API error: {response.status}")
-                    return None
+            response = await client.get(url)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                symbols = data.get("symbols", [])
+                logger.info(f"📋 Binance: {len(symbols)} symbols loaded")
+                return symbols
+            else:
+                logger.error(f"❌ Binance exchangeInfo API error: {response.status_code}")
+                return None
                     
         except Exception as e:
             logger.error(f"💥 Binance exchangeInfo error: {str(e)}")
@@ -169,52 +322,91 @@ class BinanceService:
         Returns:
             Dict or List of ticker data
         """
+        return await self.cache.get_or_fetch(
+            ("ticker24hr", symbol.upper() if symbol else None),
+            lambda: self.fetch_24h_ticker(symbol),
+            TICKER_24H_CACHE_TTL
+        )
+    
+    async def fetch_24h_ticker(self, symbol: Optional[str]) -> Optional[Dict]:
+        """Fetch 24h ticker data, bypassing the cache"""
         try:
-            session = await self.get_session()
+            client = self.client or await self.get_client()
             
-            url = f"{self.base_url}/api/v3/ticker/24hr"
+            url = self.ticker_24h_url
             params = {}
             if symbol:
                 params["symbol"] = symbol.upper()
             
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data
-                else:
-                    logger.error(f"❌ Binance 24h ticker API error: {response.status}")
-                    return None
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                return data
+            else:
+                logger.error(f"❌ Binance 24h ticker API error: {response.status_code}")
+                return None
                     
         except Exception as e:
             logger.error(f"💥 Binance 24h ticker error: {str(e)}")
             return None
     
-    async def get_all_coins_info(self) -> Optional[List[Dict]]:
+    async def get_24h_tickers(self, symbols: List[str]) -> Optional[Dict[str, Dict]]:
+        """
+        Get 24h ticker data for many symbols in a single request
+        
+        Args:
+            symbols: Symbols to fetch
+            
+        Returns:
+            Dict of 24h ticker data keyed by symbol or None if error
+        """
+        try:
+            client = self.client or await self.get_client()
+            
+            url = self.ticker_24h_url
+            params = {"symbols": orjson.dumps([symbol.upper() for symbol in symbols]).decode()}
+            
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                return {ticker["symbol"]: ticker for ticker in data}
+            else:
+                logger.error(f"❌ Binance 24h tickers API error: {response.status_code}")
+                return None
+                    
+        except Exception as e:
+            logger.error(f"💥 Binance 24h tickers error: {str(e)}")
+            return None
+    
+    async def get_all_coins_info(self, symbols: Optional[List[Dict]] = None) -> Optional[List[Dict]]:
         """
         Get all coins information (requires API key for withdrawal info)
         This is a public approximation using available data
         
+        Args:
+            symbols: Symbol listing already fetched by get_all_symbols; fetched when omitted
+        
         Returns:
             List of coin information or None if error
         """
         try:
             # Since withdrawal fees require authentication, we return exchange info instead
-            symbols = await self.get_all_symbols()
+            if symbols is None:
+                symbols = await self.get_all_symbols()
             if not symbols:
                 return None
             
-            # Extract unique coins
-            coins = {}
-            for symbol_info in symbols:
-                base = symbol_info.get('baseAsset')
-                if base and base not in coins:
-                    coins[base] = {
-                        'coin': base,
-                        'name': base,
-                        'networkList': []
-                    }
-            
-            return list(coins.values())
+            # Extract unique coins, keeping first-seen order
+            bases = dict.fromkeys(symbol_info.get('baseAsset') for symbol_info in symbols)
+            return [
+                {
+                    'coin': base,
+                    'name': base,
+                    'networkList': []
+                }
+                for base in bases
+                if base
+            ]
                     
         except Exception as e:
             logger.error(f"💥 Binance coins info error: {str(e)}")
@@ -236,9 +428,9 @@ class BinanceService:
             Each kline is: [openTime, open, high, low, close, volume, closeTime, quoteVolume, trades, takerBuyBase, takerBuyQuote, ignore]
         """
         try:
-            session = await self.get_session()
+            client = self.client or await self.get_client()
             
-            url = f"{self.base_url}/api/v3/klines"
+            url = self.klines_url
             params = {
                 "symbol": symbol.upper(),
                 "interval": interval,
@@ -250,13 +442,13 @@ class BinanceService:
             if end_time:
                 params["endTime"] = end_time
             
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data
-                else:
-                    logger.error(f"❌ Binance klines API error: {response.status}")
-                    return None
+            response = await client.get(url, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                return data
+            else:
+                logger.error(f"❌ Binance klines API error: {response.status_code}")
+                return None
                     
         except Exception as e:
             logger.error(f"💥 Binance klines error: {str(e)}")
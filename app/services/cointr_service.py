@@ -24,7 +24,13 @@ class CoinTRService:
             ssl_context.check_hostname = False
             ssl_context.verify_mode = ssl.CERT_NONE
             
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
+            # Pooled keep-alive connections so repeated calls skip TCP/TLS setup
+            connector = aiohttp.TCPConnector(
+                ssl=ssl_context,
+                limit=100,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
             self.session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=10),
                 connector=connector
@@ -183,20 +189,7 @@ class CoinTRService:
                         ticker_list = data['data']
                         
                         if isinstance(ticker_list, list) and len(ticker_list) > 0:
-                            ticker = ticker_list[0]
-                            
-                            # Parse CoinTR response fields
-                            ticker_data = {
-                                'symbol': ticker.get('symbol', symbol),
-                                'price': float(ticker.get('lastPr', 0)),
-                                'volume': float(ticker.get('baseVolume', 0)),
-                                'quoteVolume': float(ticker.get('quoteVolume', 0)),
-                                'change': float(ticker.get('change24h', 0)),
-                                'changePercent': float(ticker.get('change24h', 0)) * 100,  # Convert to percentage
-                                'high': float(ticker.get('high24h', 0)),
-                                'low': float(ticker.get('low24h', 0)),
-                                'open': float(ticker.get('open', 0))
-                            }
+                            ticker_data = self._format_ticker(ticker_list[0], symbol)
                             
                             logger.info(f"✅ CoinTR ticker for {symbol}: Price={ticker_data['price']}, Vol={ticker_data['quoteVolume']}")
                             return ticker_data
@@ -215,6 +208,56 @@ class CoinTRService:
             logger.error(f"❌ CoinTR Exception getting ticker for {symbol}: {str(e)}")
             return None
     
+    async def get_all_24hr_tickers(self, symbols: Optional[List[str]] = None) -> Optional[Dict[str, Dict]]:
+        """
+        Get 24hr ticker data for every symbol in a single request
+        
+        Args:
+            symbols: Only format tickers for these symbols (default: all)
+        
+        Returns:
+            Dict of ticker data keyed by symbol or None if error
+        """
+        try:
+            session = await self.get_session()
+            url = f"{self.base_url}/api/v2/spot/market/tickers"
+            
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    if data.get('code') == '00000' and data.get('data'):
+                        wanted = set(symbols) if symbols is not None else None
+                        return {
+                            ticker['symbol']: self._format_ticker(ticker, ticker['symbol'])
+                            for ticker in data['data']
+                            if ticker.get('symbol') and (wanted is None or ticker['symbol'] in wanted)
+                        }
+                    else:
+                        logger.error(f"❌ CoinTR tickers API error: code={data.get('code')}, msg={data.get('msg')}")
+                        return None
+                else:
+                    logger.error(f"❌ CoinTR tickers API HTTP error: {response.status}")
+                    return None
+                    
+        except Exception as e:
+            logger.error(f"💥 CoinTR get_all_24hr_tickers error: {str(e)}")
+            return None
+    
+    def _format_ticker(self, ticker: Dict, symbol: str) -> Dict:
+        """Convert a raw CoinTR ticker into our standard structure"""
+        return {
+            'symbol': ticker.get('symbol', symbol),
+            'price': float(ticker.get('lastPr', 0)),
+            'volume': float(ticker.get('baseVolume', 0)),
+            'quoteVolume': float(ticker.get('quoteVolume', 0)),
+            'change': float(ticker.get('change24h', 0)),
+            'changePercent': float(ticker.get('change24h', 0)) * 100,  # Convert to percentage
+            'high': float(ticker.get('high24h', 0)),
+            'low': float(ticker.get('low24h', 0)),
+            'open': float(ticker.get('open', 0))
+        }
+    
     async def get_all_symbols(self, quote_asset: Optional[str] = None) -> List[str]:
         """
         Get all trading symbols from CoinTR
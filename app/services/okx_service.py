@@ -17,7 +17,22 @@ class OKXService:
         self.api_url = f"{self.base_url}/api/v5"
         self.commission_bps = OKX_COMMISSION_BPS
         self.kdv_rate = KDV_RATE
-        
+        self.client: Optional[httpx.AsyncClient] = None
+    
+    async def get_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client"""
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=100, keepalive_expiry=75)
+            )
+        return self.client
+    
+    async def close(self):
+        """Close the HTTP client"""
+        if self.client and not self.client.is_closed:
+            await self.client.aclose()
+    
     def calculate_commission(self, amount: float) -> float:
         """Calculate commission from amount using bps"""
         return amount * (self.commission_bps / 10000)
@@ -61,51 +76,51 @@ class OKXService:
                 "sz": str(limit)
             }
             
-            logger.info(f"🔄 Fetching OKX orderbook for {okx_symbol}")
+            logger.info("🔄 Fetching OKX orderbook for %s", okx_symbol)
+            
+            client = await self.get_client()
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
+            if data.get("code") == "0" and data.get("data"):
+                orderbook_data = data["data"][0]  # First item contains the orderbook
                 
-                data = response.json()
+                # Format data to match our standard structure
+                formatted_data = {
+                    "symbol": symbol,
+                    "bids": [],
+                    "asks": [],
+                    "timestamp": orderbook_data.get("ts", ""),
+                    "exchange": "okx"
+                }
+                
+                # Parse bids (buyers) - format: [price, size, liquidated_orders, order_count]
+                if "bids" in orderbook_data:
+                    for bid in orderbook_data["bids"][:limit]:
+                        if len(bid) >= 2:
+                            formatted_data["bids"].append({
+                                "price": float(bid[0]),
+                                "amount": float(bid[1])
+                            })
+                
+                # Parse asks (sellers) - format: [price, size, liquidated_orders, order_count]
+                if "asks" in orderbook_data:
+                    for ask in orderbook_data["asks"][:limit]:
+                        if len(ask) >= 2:
+                            formatted_data["asks"].append({
+                                "price": float(ask[0]),
+                                "amount": float(ask[1])
+                            })
+                
+                logger.info("✅ OKX orderbook fetched: %d bids, %d asks", len(formatted_data["bids"]), len(formatted_data["asks"]))
+                return formatted_data
+                
+            else:
+                logger.warning(f"⚠️ OKX API error: {data.get('msg', 'Unknown error')}")
+                return None
                 
-                if data.get("code") == "0" and data.get("data"):
-                    orderbook_data = data["data"][0]  # First item contains the orderbook
-                    
-                    # Format data to match our standard structure
-                    formatted_data = {
-                        "symbol": symbol,
-                        "bids": [],
-                        "asks": [],
-                        "timestamp": orderbook_data.get("ts", ""),
-                        "exchange": "okx"
-                    }
-                    
-                    # Parse bids (buyers) - format: [price, size, liquidated_orders, order_count]
-                    if "bids" in orderbook_data:
-                        for bid in orderbook_data["bids"][:limit]:
-                            if len(bid) >= 2:
-                                formatted_data["bids"].append({
-                                    "price": float(bid[0]),
-                                    "amount": float(bid[1])
-                                })
-                    
-                    # Parse asks (sellers) - format: [price, size, liquidated_orders, order_count]
-                    if "asks" in orderbook_data:
-                        for ask in orderbook_data["asks"][:limit]:
-                            if len(ask) >= 2:
-                                formatted_data["asks"].append({
-                                    "price": float(ask[0]),
-                                    "amount": float(ask[1])
-                                })
-                    
-                    logger.info(f"✅ OKX orderbook fetched: {len(formatted_data['bids'])} bids, {len(formatted_data['asks'])} asks")
-                    return formatted_data
-                    
-                else:
-                    logger.warning(f"⚠️ OKX API error: {data.get('msg', 'Unknown error')}")
-                    return None
-                    
         except httpx.TimeoutException:
             logger.error("⏰ OKX API timeout")
             return None
@@ -132,33 +147,69 @@ class OKXService:
             url = f"{self.api_url}/market/ticker"
             params = {"instId": okx_symbol}
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
+            client = await self.get_client()
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if data.get("code") == "0" and data.get("data"):
+                return self._format_ticker(data["data"][0], symbol)
+            else:
+                logger.warning(f"⚠️ OKX ticker API error: {data.get('msg', 'Unknown error')}")
+                return None
                 
-                if data.get("code") == "0" and data.get("data"):
-                    ticker_data = data["data"][0]
-                    
-                    return {
-                        "symbol": symbol,
-                        "price": float(ticker_data.get("last", 0)),
-                        "vol24h": float(ticker_data.get("vol24h", 0)),
-                        "volCcy24h": float(ticker_data.get("volCcy24h", 0)),
-                        "last": float(ticker_data.get("last", 0)),
-                        "high": float(ticker_data.get("high24h", 0)),
-                        "low": float(ticker_data.get("low24h", 0)),
-                        "exchange": "okx"
-                    }
-                else:
-                    logger.warning(f"⚠️ OKX ticker API error: {data.get('msg', 'Unknown error')}")
-                    return None
-                    
         except Exception as e:
             logger.error(f"❌ OKX ticker error: {str(e)}")
             return None
     
+    async def get_all_24hr_tickers(self, inst_type: str = "SPOT") -> Optional[Dict[str, Dict]]:
+        """
+        Get ticker data for every instrument in a single request
+        
+        Args:
+            inst_type: Instrument type (SPOT, FUTURES, SWAP, OPTION)
+            
+        Returns:
+            Dict of ticker data keyed by instId or None if error
+        """
+        try:
+            url = f"{self.api_url}/market/tickers"
+            params = {"instType": inst_type}
+            
+            client = await self.get_client()
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if data.get("code") == "0" and data.get("data"):
+                return {
+                    ticker_data["instId"]: self._format_ticker(ticker_data, ticker_data["instId"])
+                    for ticker_data in data["data"]
+                    if ticker_data.get("instId")
+                }
+            else:
+                logger.warning(f"⚠️ OKX tickers API error: {data.get('msg', 'Unknown error')}")
+                return None
+                
+        except Exception as e:
+            logger.error(f"❌ OKX tickers error: {str(e)}")
+            return None
+    
+    def _format_ticker(self, ticker_data: Dict, symbol: str) -> Dict:
+        """Convert a raw OKX ticker into our standard structure"""
+        return {
+            "symbol": symbol,
+            "price": float(ticker_data.get("last", 0)),
+            "vol24h": float(ticker_data.get("vol24h", 0)),
+            "volCcy24h": float(ticker_data.get("volCcy24h", 0)),
+            "last": float(ticker_data.get("last", 0)),
+            "high": float(ticker_data.get("high24h", 0)),
+            "low": float(ticker_data.get("low24h", 0)),
+            "exchange": "okx"
+        }
+    
     async def get_all_instruments(self, inst_type: str = "SPOT") -> Optional[List[Dict]]:
         """
         Get all trading instruments from OKX
@@ -173,19 +224,19 @@ class OKXService:
             url = f"{self.api_url}/public/instruments"
             params = {"instType": inst_type}
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
+            client = await self.get_client()
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if data.get("code") == "0" and data.get("data"):
+                logger.info(f"📋 OKX: {len(data['data'])} instruments loaded")
+                return data["data"]
+            else:
+                logger.warning(f"⚠️ OKX instruments API error: {data.get('msg', 'Unknown error')}")
+                return None
                 
-                if data.get("code") == "0" and data.get("data"):
-                    logger.info(f"📋 OKX: {len(data['data'])} instruments loaded")
-                    return data["data"]
-                else:
-                    logger.warning(f"⚠️ OKX instruments API error: {data.get('msg', 'Unknown error')}")
-                    return None
-                    
         except Exception as e:
             logger.error(f"❌ OKX instruments error: {str(e)}")
             return None
@@ -215,18 +266,18 @@ class OKXService:
             if after:
                 params["after"] = str(after)
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
+            client = await self.get_client()
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if data.get("code") == "0" and data.get("data"):
+                return data["data"]
+            else:
+                logger.warning(f"⚠️ OKX candles API error: {data.get('msg', 'Unknown error')}")
+                return None
                 
-                if data.get("code") == "0" and data.get("data"):
-                    return data["data"]
-                else:
-                    logger.warning(f"⚠️ OKX candles API error: {data.get('msg', 'Unknown error')}")
-                    return None
-                    
         except Exception as e:
             logger.error(f"❌ OKX candles error: {str(e)}")
             return None
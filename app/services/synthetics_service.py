@@ -9,7 +9,7 @@ from app.services.binance_service import binance_service
 from app.services.cointr_service import cointr_service
 from app.services.whitebit_service import whitebit_service
 from app.services.okx_service import okx_service
-from app.api.orderbook import convert_symbol_format
+from app.api.orderbook import convert_symbol_format, fetch_orderbook
 
 class SyntheticsService:
     def __init__(self):
@@ -115,12 +115,12 @@ class SyntheticsService:
             Orderbook data or None if failed
         """
         try:
-            service = self.exchange_services[exchange]
             converted_symbol = convert_symbol_format(symbol, exchange)
             
-            logger.debug(f"Fetching {exchange} orderbook for {symbol} -> {converted_symbol}")
+            logger.debug("Fetching %s orderbook for %s -> %s", exchange, symbol, converted_symbol)
             
-            orderbook = await service.get_orderbook(converted_symbol, limit)
+            # Shared with the orderbook routes so concurrent identical fetches coalesce
+            orderbook = await fetch_orderbook(self.exchange_services[exchange], converted_symbol, limit)
             return orderbook
         
         except Exception as e:
@@ -178,7 +178,7 @@ class SyntheticsService:
             commission_factor = self.calculate_commission_factor(first_leg["exchange"])
             effective_price = current_price * commission_factor
             
-            logger.debug(f"Leg 1 ({first_leg['exchange']}): price={current_price}, amount={current_amount}, comm_factor={commission_factor:.6f}")
+            logger.debug("Leg 1 (%s): price=%s, amount=%s, comm_factor=%.6f", first_leg["exchange"], current_price, current_amount, commission_factor)
             
             # Calculate intermediate currency amount needed
             intermediate_amount = current_amount * effective_price
@@ -198,7 +198,7 @@ class SyntheticsService:
                 )
                 
                 if consumed_amount < intermediate_amount * 0.95:  # Allow 5% slippage tolerance
-                    logger.debug(f"Leg {i+1}: insufficient liquidity, consumed {consumed_amount:.6f} of {intermediate_amount:.6f}")
+                    logger.debug("Leg %d: insufficient liquidity, consumed %.6f of %.6f", i + 1, consumed_amount, intermediate_amount)
                     valid_chain = False
                     break
                 
@@ -210,7 +210,7 @@ class SyntheticsService:
                 leg_commission_factor = self.calculate_commission_factor(leg["exchange"])
                 effective_leg_price = avg_price * leg_commission_factor
                 
-                logger.debug(f"Leg {i+1} ({leg['exchange']}): avg_price={avg_price}, comm_factor={leg_commission_factor:.6f}")
+                logger.debug("Leg %d (%s): avg_price=%s, comm_factor=%.6f", i + 1, leg["exchange"], avg_price, leg_commission_factor)
                 
                 # Update chain price and amount for next iteration
                 chain_price *= effective_leg_price
@@ -360,12 +360,10 @@ class SyntheticsService:
         logger.info(f"Creating synthetic orderbook with {len(legs)} legs, depth={depth}")
         
         # Fetch orderbooks for all legs in parallel
-        fetch_tasks = []
-        for leg in legs:
-            task = self.fetch_leg_orderbook(leg["exchange"], leg["symbol"], depth * 2)
-            fetch_tasks.append(task)
-        
-        orderbooks = await asyncio.gather(*fetch_tasks, return_exceptions=True)
+        orderbooks = await asyncio.gather(
+            *(self.fetch_leg_orderbook(leg["exchange"], leg["symbol"], depth * 2) for leg in legs),
+            return_exceptions=True
+        )
         
         # Prepare legs data
         legs_data = []
@@ -381,7 +379,7 @@ class SyntheticsService:
             legs_data.append(leg_data)
             
             if leg_data["available"]:
-                logger.debug(f"Leg {i+1} ({leg['exchange']} {leg['symbol']}): ✅ Available")
+                logger.debug("Leg %d (%s %s): ✅ Available", i + 1, leg["exchange"], leg["symbol"])
             else:
                 logger.warning(f"Leg {i+1} ({leg['exchange']} {leg['symbol']}): ❌ Unavailable")
         
@@ -1,7 +1,7 @@
 """
 Wallet service - handles wallet-related business logic
 """
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 from fastapi import HTTPException
@@ -19,22 +19,48 @@ class WalletService:
     def __init__(self):
         self.balance_service = BalanceService()
 
-    async def get_wallets_with_balances(self, db: AsyncSession, bypass_cache: bool = False) -> List[WalletWithBalances]:
-        """Get all monitored wallets with their current balances"""
+    async def get_wallets_with_balances(
+        self,
+        db: AsyncSession,
+        bypass_cache: bool = False,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[WalletWithBalances]:
+        """
+        Get monitored wallets with their current balances
+        
+        Args:
+            db: Database session
+            bypass_cache: Unused, kept for compatibility
+            limit: Page size; when None all wallets are returned, newest first
+            after_id: Keyset cursor, only wallets with a larger id are returned
+        
+        Returns:
+            List of wallets with balances, ordered by id when paginated
+        """
         
         logger.info(f"🚀 Fetching fresh wallet data (cache disabled)")
         
-        # Get all active wallets with relationships
-        result = await db.execute(
+        # Get active wallets with relationships
+        query = (
             select(Wallet)
             .options(
                 selectinload(Wallet.blockchain_ref),
                 selectinload(Wallet.wallet_tokens).selectinload(WalletToken.token)
             )
             .where(Wallet.is_active == True)
-            .order_by(Wallet.created_at.desc())
         )
         
+        if limit is None:
+            query = query.order_by(Wallet.created_at.desc())
+        else:
+            # Keyset pagination on the primary key
+            if after_id is not None:
+                query = query.where(Wallet.id > after_id)
+            query = query.order_by(Wallet.id).limit(limit)
+        
+        result = await db.execute(query)
+        
         wallets = result.scalars().all()
         
         wallet_list = []
@@ -24,7 +24,13 @@ class WhiteBitService:
             ssl_context.check_hostname = False
             ssl_context.verify_mode = ssl.CERT_NONE
             
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
+            # Pooled keep-alive connections so repeated calls skip TCP/TLS setup
+            connector = aiohttp.TCPConnector(
+                ssl=ssl_context,
+                limit=100,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
             self.session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=10),
                 connector=connector
@@ -163,23 +169,7 @@ class WhiteBitService:
                     data = await response.json()
                     
                     if symbol in data:
-                        ticker_data = data[symbol]
-                        
-                        # WhiteBit v4 API response format:
-                        # {base_id, quote_id, last_price, quote_volume, base_volume, isFrozen, change}
-                        last_price = float(ticker_data.get("last_price", 0))
-                        
-                        ticker = {
-                            "symbol": symbol,
-                            "price": last_price,
-                            "lastPrice": last_price,
-                            "change": float(ticker_data.get("change", "0")),
-                            "changePercent": float(ticker_data.get("change", "0")),  # WhiteBit change is already in percentage
-                            "high": last_price,  # WhiteBit doesn't provide high/low
-                            "low": last_price,
-                            "volume": float(ticker_data.get("base_volume", "0")),
-                            "quoteVolume": float(ticker_data.get("quote_volume", "0"))
-                        }
+                        ticker = self._format_ticker(data[symbol], symbol)
                         
                         logger.info(f"📈 WhiteBit 24hr ticker for {symbol}: {ticker['price']} ({ticker['changePercent']:+.2f}%)")
                         return ticker
@@ -194,6 +184,56 @@ class WhiteBitService:
             logger.error(f"💥 WhiteBit 24hr ticker error: {str(e)}")
             return None
     
+    async def get_all_24hr_tickers(self, symbols: Optional[List[str]] = None) -> Optional[Dict[str, Dict]]:
+        """
+        Get 24hr ticker statistics for every market in a single request
+        
+        Args:
+            symbols: Only format tickers for these markets (default: all)
+        
+        Returns:
+            Dict of ticker data keyed by market symbol or None if error
+        """
+        try:
+            session = await self.get_session()
+            
+            # WhiteBit v4 ticker endpoint already returns every market
+            url = f"{self.base_url}/api/v4/public/ticker"
+            
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    wanted = data if symbols is None else [symbol for symbol in symbols if symbol in data]
+                    return {
+                        symbol: self._format_ticker(data[symbol], symbol)
+                        for symbol in wanted
+                    }
+                else:
+                    logger.error(f"❌ WhiteBit 24hr tickers API error: {response.status}")
+                    return None
+                    
+        except Exception as e:
+            logger.error(f"💥 WhiteBit 24hr tickers error: {str(e)}")
+            return None
+    
+    def _format_ticker(self, ticker_data: Dict, symbol: str) -> Dict:
+        """Convert a raw WhiteBit v4 ticker into our standard structure"""
+        # WhiteBit v4 API response format:
+        # {base_id, quote_id, last_price, quote_volume, base_volume, isFrozen, change}
+        last_price = float(ticker_data.get("last_price", 0))
+        
+        return {
+            "symbol": symbol,
+            "price": last_price,
+            "lastPrice": last_price,
+            "change": float(ticker_data.get("change", "0")),
+            "changePercent": float(ticker_data.get("change", "0")),  # WhiteBit change is already in percentage
+            "high": last_price,  # WhiteBit doesn't provide high/low
+            "low": last_price,
+            "volume": float(ticker_data.get("base_volume", "0")),
+            "quoteVolume": float(ticker_data.get("quote_volume", "0"))
+        }
+    
     async def get_markets(self) -> Optional[Dict]:
         """
         Get all markets from WhiteBit
@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from database import AsyncSessionLocal, Blockchain, Token, Wallet, WalletToken, BalanceHistory
 from btc_service import btc_client
 from websocket_manager import manager
+from app.core.cache import invalidate_history_cache
 
 logger = logging.getLogger(__name__)
 
@@ -180,6 +181,7 @@ class BitcoinMonitor:
             wallet.last_updated = datetime.utcnow()
             
             await db.commit()
+            invalidate_history_cache()
             logger.info(f"Updated Bitcoin wallet {wallet.address}: {btc_balance} BTC")
             
         except Exception as e:
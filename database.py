@@ -110,7 +110,7 @@ class BalanceHistory(Base):
     usd_value_after = Column(Float, nullable=True)
     transaction_hash = Column(String(100), nullable=True)  # Related transaction if available
     change_type = Column(String(20), nullable=False)  # 'increase', 'decrease', 'transfer_in', 'transfer_out'
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, default=datetime.utcnow)  # Indexed by idx_balance_history_timestamp
     
     # Indexes for performance
     __table_args__ = (
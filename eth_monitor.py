@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from database import AsyncSessionLocal, Blockchain, Token, Wallet, WalletToken, BalanceHistory
 from eth_service import EthereumService
 from websocket_manager import manager
+from app.core.cache import invalidate_history_cache
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +137,7 @@ class EthereumMonitor:
             # Update wallet timestamp
             wallet.last_updated = datetime.utcnow()
             await db.commit()
+            invalidate_history_cache()
             
             # Log significant balances
             significant_balances = {
@@ -350,8 +352,6 @@ class EthereumMonitor:
                         }
                     })
                 
-                logger.info("🔄 CRUD cache disabled - no cache invalidation needed")
-                
         except Exception as e:
             logger.error(f"Error creating balance history: {e}")
     
@@ -802,6 +802,7 @@ class EthereumService:
         """Create balance history record after a transaction"""
         try:
             from database import get_db, BalanceHistory, Token, Blockchain, Wallet
+            from app.core.cache import invalidate_history_cache
             from sqlalchemy import select
             
             async for db in get_db():
@@ -858,6 +859,7 @@ class EthereumService:
                     )
                     db.add(history)
                     await db.commit()
+                    invalidate_history_cache()
                     
                     logger.info(f"Created ETH transaction balance history for wallet {wallet_id}, amount: {tx_amount}")
                     
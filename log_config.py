@@ -2,11 +2,14 @@
 Logging configuration for WalletTrack
 Filters out unnecessary logs and keeps only important information
 """
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Get log level from environment
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -122,9 +125,42 @@ LOGGING_CONFIG: Dict[str, Any] = {
     }
 }
 
+# Background listener that writes queued records to the console handler
+queue_listener: Optional[logging.handlers.QueueListener] = None
+
+def enable_queue_logging():
+    """
+    Route console output through a queue drained by a background thread
+    
+    Log calls from request handlers only enqueue the record, so a slow
+    stdout never blocks the event loop.
+    """
+    global queue_listener
+    if queue_listener is not None:
+        return
+    
+    root_logger = logging.getLogger()
+    console_handler = next((h for h in root_logger.handlers if h.get_name() == "console"), None)
+    if console_handler is None:
+        return
+    
+    queue_handler = logging.handlers.QueueHandler(queue.Queue(-1))
+    for name in [None, *LOGGING_CONFIG["loggers"]]:
+        logger = logging.getLogger(name)
+        if console_handler in logger.handlers:
+            logger.removeHandler(console_handler)
+            logger.addHandler(queue_handler)
+    
+    queue_listener = logging.handlers.QueueListener(
+        queue_handler.queue, console_handler, respect_handler_level=True
+    )
+    queue_listener.start()
+    atexit.register(queue_listener.stop)
+
 def setup_logging():
     """Setup logging configuration"""
     logging.config.dictConfig(LOGGING_CONFIG)
+    enable_queue_logging()
     
     # Suppress specific noisy loggers
     logging.getLogger("httpx").setLevel(logging.WARNING)
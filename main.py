@@ -3,6 +3,7 @@ Main application entry point for WalletTrack
 Modular structure with separated concerns
 """
 from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
@@ -12,6 +13,7 @@ setup_logging()
 
 from app.core.config import APP_TITLE, APP_DESCRIPTION, APP_VERSION
 from app.core.dependencies import lifespan, logger
+from app.core.exceptions import UpstreamError
 from app.api import wallets, transactions, balances, tokens, system, orderbook, synthetics, exchange_analytics
 from app.websocket_handler import websocket_endpoint
 
@@ -20,9 +22,19 @@ app = FastAPI(
     title=APP_TITLE,
     description=APP_DESCRIPTION,
     version=APP_VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+@app.exception_handler(UpstreamError)
+async def upstream_error_handler(request: Request, exc: UpstreamError):
+    """Report upstream exchange failures as 503 Service Unavailable"""
+    logger.warning(f"⚠️ {exc}")
+    return ORJSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "exchange": exc.exchange, "symbol": exc.symbol}
+    )
+
 # Templates
 templates = Jinja2Templates(directory="templates")
 
@@ -76,4 +88,5 @@ async def websocket_route(websocket: WebSocket):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop and httptools ship with uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
@@ -77,6 +77,10 @@ class TokenBalance(BaseModel):
     usd_value: Optional[float] = Field(None, ge=0, description="USD equivalent")
     last_updated: datetime
 
+class TokenVisibilityUpdate(BaseModel):
+    hidden: List[int] = Field(default_factory=list, description="Token IDs to hide")
+    shown: List[int] = Field(default_factory=list, description="Token IDs to show")
+
 class WalletTokenResponse(BaseModel):
     id: int
     wallet_id: int
@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from database import AsyncSessionLocal, Blockchain, Token, Wallet, WalletToken, BalanceHistory
 from solana_service import solana_client
 from websocket_manager import manager
+from app.core.cache import invalidate_history_cache
 
 logger = logging.getLogger(__name__)
 
@@ -177,6 +178,7 @@ class SolanaMonitor:
             wallet.last_updated = datetime.utcnow()
             
             await db.commit()
+            invalidate_history_cache()
             
             # Send WebSocket notification
             if self.enable_notifications and token_balances:
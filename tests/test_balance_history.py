@@ -0,0 +1,150 @@
+"""
+Query-count tests for the balance history endpoints
+"""
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import StaticPool
+
+from database import Base, Blockchain, Token, Wallet, WalletToken, BalanceHistory
+from app.core.cache import invalidate_history_cache
+from app.services.balance_service import BalanceService
+
+@pytest_asyncio.fixture
+async def engine():
+    """In-memory SQLite engine with the full schema"""
+    # StaticPool keeps the single in-memory database alive across sessions
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    """Session factory configured like AsyncSessionLocal"""
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+@pytest.fixture
+def query_counter(engine):
+    """Count the statements sent to the database"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture
+def balance_service():
+    """Create a BalanceService with an empty history cache"""
+    invalidate_history_cache()
+    yield BalanceService()
+    invalidate_history_cache()
+
+async def seed_wallets(session_factory, wallet_count: int, token_count: int, history_per_token: int):
+    """
+    Add wallets, each holding token_count tokens with history_per_token recent changes
+
+    Returns:
+        IDs of the new wallets
+    """
+    async with session_factory() as session:
+        blockchain = (await session.execute(select(Blockchain))).scalars().first()
+        if blockchain is None:
+            blockchain = Blockchain(name="ETH", display_name="Ethereum", native_symbol="ETH")
+            session.add(blockchain)
+            await session.flush()
+        blockchain_id = blockchain.id
+
+        wallet_ids = []
+        now = datetime.utcnow()
+        for _ in range(wallet_count):
+            wallet = Wallet(address=f"0x{uuid4().hex}", blockchain_id=blockchain_id)
+            session.add(wallet)
+            await session.flush()
+            wallet_ids.append(wallet.id)
+
+            for token_index in range(token_count):
+                token = Token(symbol=f"T{wallet.id}_{token_index}", name=f"Token {token_index}", blockchain_id=blockchain_id)
+                session.add(token)
+                await session.flush()
+                session.add(WalletToken(wallet_id=wallet.id, token_id=token.id, balance=100.0, last_updated=now))
+
+                for history_index in range(history_per_token):
+                    session.add(BalanceHistory(
+                        wallet_id=wallet.id,
+                        token_id=token.id,
+                        balance_before=90.0,
+                        balance_after=100.0,
+                        change_amount=10.0,
+                        change_percentage=11.1,
+                        change_type="increase",
+                        timestamp=now - timedelta(minutes=history_index + 1)
+                    ))
+
+        await session.commit()
+        return wallet_ids
+
+class TestBalanceHistoryQueries:
+
+    @pytest.mark.asyncio
+    async def test_wallet_history_query_count_is_constant(self, balance_service, session_factory, query_counter):
+        """Test that a wallet's history takes the same number of queries however many rows it has"""
+        small_wallet_id, = await seed_wallets(session_factory, wallet_count=1, token_count=1, history_per_token=1)
+        large_wallet_id, = await seed_wallets(session_factory, wallet_count=1, token_count=5, history_per_token=10)
+
+        query_counter.clear()
+        async with session_factory() as session:
+            small_history = await balance_service.get_wallet_balance_history(session, small_wallet_id)
+        small_query_count = len(query_counter)
+
+        query_counter.clear()
+        async with session_factory() as session:
+            large_history = await balance_service.get_wallet_balance_history(session, large_wallet_id)
+        large_query_count = len(query_counter)
+
+        assert len(small_history["token_histories"]) == 1
+        assert len(large_history["token_histories"]) == 5
+        assert large_query_count == small_query_count
+
+    @pytest.mark.asyncio
+    async def test_all_wallets_history_query_count_is_constant(self, balance_service, session_factory, query_counter):
+        """Test that the all-wallets history doesn't issue queries per wallet or per record"""
+        await seed_wallets(session_factory, wallet_count=1, token_count=1, history_per_token=1)
+
+        query_counter.clear()
+        async with session_factory() as session:
+            small_history = await balance_service.get_all_wallets_history(session)
+        small_query_count = len(query_counter)
+
+        await seed_wallets(session_factory, wallet_count=4, token_count=3, history_per_token=5)
+        invalidate_history_cache()
+
+        query_counter.clear()
+        async with session_factory() as session:
+            large_history = await balance_service.get_all_wallets_history(session)
+        large_query_count = len(query_counter)
+
+        assert small_history["total_wallets"] == 1
+        assert large_history["total_wallets"] == 5
+        assert all(wallet["recent_changes"] for wallet in large_history["wallets"])
+        assert large_query_count == small_query_count
+
+    @pytest.mark.asyncio
+    async def test_wallet_history_is_served_from_cache(self, balance_service, session_factory, query_counter):
+        """Test that a repeated history read doesn't touch the database"""
+        wallet_id, = await seed_wallets(session_factory, wallet_count=1, token_count=2, history_per_token=3)
+
+        async with session_factory() as session:
+            first = await balance_service.get_wallet_balance_history(session, wallet_id)
+            query_counter.clear()
+            second = await balance_service.get_wallet_balance_history(session, wallet_id)
+
+        assert second == first
+        assert query_counter == []
@@ -0,0 +1,241 @@
+"""
+Unit tests for the in-memory caches
+"""
+import pytest
+import asyncio
+import time
+from datetime import datetime
+from app.core.cache import (
+    SimpleCache, SingleFlightCache,
+    get_wallet_history_cache_key, get_all_wallets_history_cache_key, get_status_cache_key
+)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.time, which the cache uses for expiry"""
+    class Clock:
+        now = 1000.0
+
+        def advance(self, seconds: float):
+            self.now += seconds
+
+    fake_clock = Clock()
+    monkeypatch.setattr(time, "time", lambda: fake_clock.now)
+    return fake_clock
+
+class TestSimpleCache:
+
+    def test_set_get_round_trip(self):
+        """Test that packed values come back equal but as fresh copies"""
+        cache = SimpleCache(default_ttl=30)
+        value = {"symbol": "ETH", "balances": [1.5, 2.0], "hidden": False}
+
+        cache.set("key", value)
+        cached = cache.get("key")
+
+        assert cached == value
+        assert cached is not value
+
+    def test_raw_cache_returns_same_object(self):
+        """Test that raw caches store objects as-is"""
+        cache = SimpleCache(default_ttl=30, raw=True)
+        value = {"timestamp": datetime(2024, 1, 1)}
+
+        cache.set("key", value)
+
+        assert cache.get("key") is value
+
+    def test_get_missing_key(self):
+        """Test cache miss"""
+        cache = SimpleCache()
+        assert cache.get("missing") is None
+
+    def test_get_expired_entry(self, clock):
+        """Test that expired entries are not returned and are dropped on read"""
+        cache = SimpleCache(default_ttl=30)
+        cache.set("key", 1)
+
+        clock.advance(29)
+        assert cache.get("key") == 1
+
+        clock.advance(2)
+        assert cache.get("key") is None
+        assert "key" not in cache.cache
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted past maxsize"""
+        cache = SimpleCache(default_ttl=30, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Reading a makes b the least recently used
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache.cache) == 2
+
+    def test_cleanup_expired(self, clock):
+        """Test that cleanup removes only expired entries"""
+        cache = SimpleCache(default_ttl=10)
+        cache.set("short", 1, ttl=5)
+        cache.set("long", 2, ttl=20)
+
+        clock.advance(6)
+        cache.cleanup_expired()
+
+        assert "short" not in cache.cache
+        assert cache.get("long") == 2
+
+    def test_cleanup_skips_superseded_expiry(self, clock):
+        """Test that re-setting a key with a longer TTL survives its old expiry"""
+        cache = SimpleCache(default_ttl=10)
+        cache.set("key", 1, ttl=5)
+        cache.set("key", 2, ttl=20)
+
+        clock.advance(6)
+        cache.cleanup_expired()
+
+        assert cache.get("key") == 2
+
+    def test_delete_and_clear(self):
+        """Test explicit removal"""
+        cache = SimpleCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.delete("a") is True
+        assert cache.delete("a") is False
+        assert cache.get("a") is None
+
+        cache.clear()
+        assert cache.get("b") is None
+        assert cache.expiry_heap == []
+
+    def test_get_stats(self, clock):
+        """Test entry counts and packed memory usage"""
+        cache = SimpleCache(default_ttl=10)
+        cache.set("a", "x" * 100)
+        cache.set("b", 1, ttl=1)
+
+        clock.advance(2)
+        stats = cache.get_stats()
+
+        assert stats["total_entries"] == 2
+        assert stats["active_entries"] == 1
+        assert stats["expired_entries"] == 1
+        assert stats["memory_usage_kb"] > 0
+        assert SimpleCache(raw=True).get_stats()["memory_usage_kb"] is None
+
+class TestSingleFlightCache:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self):
+        """Test that concurrent callers for the same key trigger a single fetch"""
+        cache = SingleFlightCache(default_ttl=1.0)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"price": 34.5}
+
+        results = await asyncio.gather(*(cache.get_or_fetch("price", fetch) for _ in range(5)))
+
+        assert calls == 1
+        assert all(result == {"price": 34.5} for result in results)
+
+    @pytest.mark.asyncio
+    async def test_result_expires_after_ttl(self):
+        """Test that a cached result is refetched once its TTL has passed"""
+        cache = SingleFlightCache()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await cache.get_or_fetch("key", fetch, ttl=0.02) == 1
+        assert await cache.get_or_fetch("key", fetch, ttl=0.02) == 1
+
+        await asyncio.sleep(0.05)
+        assert await cache.get_or_fetch("key", fetch, ttl=0.02) == 2
+
+    @pytest.mark.asyncio
+    async def test_none_result_not_cached(self):
+        """Test that a None (error) result is not kept"""
+        cache = SingleFlightCache(default_ttl=1.0)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return None
+
+        assert await cache.get_or_fetch("key", fetch) is None
+        # Let the done callback drop the entry
+        await asyncio.sleep(0)
+        assert await cache.get_or_fetch("key", fetch) is None
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_not_cached(self):
+        """Test that a failed fetch propagates and is retried on the next call"""
+        cache = SingleFlightCache(default_ttl=1.0)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("upstream down")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("key", fetch)
+        await asyncio.sleep(0)
+
+        assert await cache.get_or_fetch("key", fetch) == "ok"
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self):
+        """Test that different keys don't share results"""
+        cache = SingleFlightCache(default_ttl=1.0)
+
+        async def fetch_a():
+            return "a"
+
+        async def fetch_b():
+            return "b"
+
+        assert await cache.get_or_fetch(("depth", "BTCUSDT", 20), fetch_a) == "a"
+        assert await cache.get_or_fetch(("depth", "BTCUSDT", 5), fetch_b) == "b"
+
+class TestCacheKeys:
+
+    def test_generate_key_ignores_argument_order(self):
+        """Test that keyword order doesn't change the key"""
+        cache = SimpleCache()
+        key = cache._generate_key("tokens", blockchain_id=1, verified_only=True)
+
+        assert key == cache._generate_key("tokens", verified_only=True, blockchain_id=1)
+        assert hash(key) == hash(cache._generate_key("tokens", verified_only=True, blockchain_id=1))
+
+    def test_history_keys_distinguish_parameters(self):
+        """Test that history keys differ by wallet and time range"""
+        assert get_wallet_history_cache_key(1, 24, 7) == get_wallet_history_cache_key(1, 24, 7)
+        assert get_wallet_history_cache_key(1, 24, 7) != get_wallet_history_cache_key(2, 24, 7)
+        assert get_wallet_history_cache_key(1, 24, 7) != get_wallet_history_cache_key(1, 24, 0)
+        assert get_all_wallets_history_cache_key(7, 0) != get_all_wallets_history_cache_key(0, 7)
+
+    def test_status_key_follows_bound(self):
+        """Test that the status key only changes with the window bound"""
+        bound = datetime(2024, 1, 1, 12, 30)
+
+        assert get_status_cache_key(bound) == get_status_cache_key(datetime(2024, 1, 1, 12, 30))
+        assert get_status_cache_key(bound) != get_status_cache_key(datetime(2024, 1, 1, 12, 31))
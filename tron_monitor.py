@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from database import AsyncSessionLocal, Blockchain, Token, Wallet, WalletToken, BalanceHistory
 from tron_service import TronGridClient, tron_client
 from websocket_manager import manager
+from app.core.cache import invalidate_history_cache
 
 logger = logging.getLogger(__name__)
 
@@ -143,6 +144,7 @@ class TronMonitor:
             # Update wallet timestamp
             wallet.last_updated = datetime.utcnow()
             await db.commit()
+            invalidate_history_cache()
             
             # Log significant balances
             significant_balances = {
@@ -366,8 +368,6 @@ class TronMonitor:
                     logger.info(f"📡 Sending WebSocket balance update: {websocket_data}")
                     await manager.broadcast(websocket_data)
                 
-                logger.info("🔄 CRUD cache disabled - no cache invalidation needed")
-                
         except Exception as e:
             logger.error(f"Error creating TRON balance history: {e}")
     
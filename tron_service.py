@@ -16,6 +16,7 @@ from tronpy.exceptions import AddressNotFound
 
 from database import get_db, Wallet, WalletToken, Token, Blockchain, BalanceHistory
 from websocket_manager import manager
+from app.core.cache import invalidate_history_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -552,6 +553,7 @@ class TronGridClient:
                     )
                     db.add(history)
                     await db.commit()
+                    invalidate_history_cache()
                     
                     logger.info(f"Created TRON transaction balance history for wallet {wallet_id}, amount: {tx_amount}")
                     
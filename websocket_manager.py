@@ -1,27 +1,37 @@
 import asyncio
-import json
 import logging
+
+import orjson
 from typing import Set
 
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+# Seconds a single client may take to accept a broadcast before it is dropped
+SEND_TIMEOUT = 5.0
+
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates"""
     
     def __init__(self):
         self.active_connections: Set[WebSocket] = set()
+        # Kept in step with active_connections so hot paths can skip building broadcasts
+        self.active_count = 0
+        # Strong references to in-flight background broadcasts so they aren't garbage collected
+        self.broadcast_tasks: Set[asyncio.Task] = set()
     
     async def connect(self, websocket: WebSocket):
         """Accept a new WebSocket connection"""
         await websocket.accept()
         self.active_connections.add(websocket)
+        self.active_count = len(self.active_connections)
         logger.info(f"New WebSocket connection. Total: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection"""
         self.active_connections.discard(websocket)
+        self.active_count = len(self.active_connections)
         logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
     
     async def send_personal_message(self, message: str, websocket: WebSocket):
@@ -34,34 +44,44 @@ class ConnectionManager:
     
     async def broadcast(self, message: dict):
         """Broadcast a message to all connected clients"""
-        if not self.active_connections:
+        if not self.active_count:
             logger.info("📡 No active WebSocket connections for broadcast")
             return
         
         logger.info(f"📡 Broadcasting to {len(self.active_connections)} connections: {message.get('type', 'unknown')}")
-        message_str = json.dumps(message, default=str)
+        # Serialized once and sent as the same text frame to every client
+        message_str = orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
         disconnected = set()
         
-        for connection in self.active_connections.copy():  # Use copy to avoid modification during iteration
+        async def send(connection: WebSocket):
             try:
                 # Check if connection is still active before sending
                 try:
                     if hasattr(connection, 'client_state') and connection.client_state.name == "CONNECTED":
-                        await connection.send_text(message_str)
+                        await asyncio.wait_for(connection.send_text(message_str), SEND_TIMEOUT)
                     else:
                         logger.warning(f"Connection state not CONNECTED, marking for removal")
                         disconnected.add(connection)
                 except AttributeError:
                     # Fallback: try to send anyway if client_state is not available
-                    await connection.send_text(message_str)
+                    await asyncio.wait_for(connection.send_text(message_str), SEND_TIMEOUT)
             except Exception as e:
-                logger.error(f"Error broadcasting to connection: {e}")
+                logger.error(f"Error broadcasting to connection: {e!r}")
                 disconnected.add(connection)
         
+        # Send to all clients concurrently so one slow client doesn't delay the rest
+        await asyncio.gather(*map(send, self.active_connections.copy()))
+        
         # Remove disconnected connections
         for conn in disconnected:
             self.disconnect(conn)
     
+    def broadcast_in_background(self, message: dict):
+        """Schedule a broadcast without waiting for the sends to complete"""
+        task = asyncio.create_task(self.broadcast(message))
+        self.broadcast_tasks.add(task)
+        task.add_done_callback(self.broadcast_tasks.discard)
+    
     async def broadcast_balance_update(self, wallet_id: int, address: str, name: str, 
                                      blockchain: str = "TRON", **kwargs):
         """Broadcast balance update to all clients"""
@@ -137,7 +157,7 @@ class ConnectionManager:
     
     def get_connection_count(self) -> int:
         """Get current connection count"""
-        return len(self.active_connections)
+        return self.active_count
 
 # Global connection manager instance
 manager = ConnectionManager()